@@ -7,14 +7,19 @@ import streamlit as st
 import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta, date
-import random
 from streamlit_option_menu import option_menu
-import plotly.graph_objects as go
-import plotly.express as px
 import io
 import json
-from openpyxl import load_workbook
-from openpyxl.comments import Comment
+import xlsxwriter
+import pyarrow as pa
+import pyarrow.csv as pacsv
+
+# 엑셀 파싱 가속용 선택 의존성 (설치되어 있으면 read_excel에 calamine 엔진 사용)
+try:
+    import python_calamine  # noqa: F401
+    _HAS_CALAMINE = True
+except ImportError:
+    _HAS_CALAMINE = False
 
 # ============================================================================
 # 상수 정의
@@ -31,6 +36,35 @@ DEFAULT_APP_TITLE = "IronFlow - 조선기자재 스마트 스케줄러"
 PROCESS_TYPE_LABELS = {"Duration": "기간", "Milestone": "마일스톤"}
 PROCESS_TYPE_VALUES = {v: k for k, v in PROCESS_TYPE_LABELS.items()}
 
+# 반복 사용되는 1일 상수 (루프 안에서 매번 생성하지 않도록 모듈 수준에 고정)
+ONE_DAY = pd.Timedelta(days=1)
+ONE_DAY_NP = np.timedelta64(1, 'D')
+
+# 상단 메뉴 스타일과 버전 표기 HTML (내용이 고정이라 rerun마다 재구성하지 않음)
+MENU_STYLES = {
+    "container": {"padding": "0!important", "background-color": "#fafafa"},
+    "icon": {"color": "orange", "font-size": "18px"},
+    "nav-link": {
+        "font-size": "16px",
+        "text-align": "center",
+        "margin": "0px",
+        "--hover-color": "#eee",
+    },
+    "nav-link-selected": {"background-color": "#02ab21"},
+}
+VERSION_HTML = (
+    f'<div style="text-align: right; padding-top: 10px; color: #666; font-size: 12px;">'
+    f'{APP_VERSION}<br>{APP_AUTHOR}'
+    f'</div>'
+)
+
+# 부하 분석 기간 단위: 라벨 → (Period freq, 월간 CAPA 환산 계수)의 단일 출처
+LOAD_TIME_SCALES = {
+    "주간(Weekly)": ("W", 1 / 4.3),
+    "월간(Monthly)": ("M", 1.0),
+    "연간(Yearly)": ("Y", 12.0),
+}
+
 # ============================================================================
 # 페이지 설정
 # ============================================================================
@@ -55,30 +89,46 @@ def init_session_state():
         }
     if 'global_holidays' not in st.session_state:
         st.session_state.global_holidays = set()
+    if 'global_holidays_np' not in st.session_state:
+        # 스케줄 계산에서 바로 쓸 수 있는 사전 변환 배열 (편집 시에만 갱신)
+        st.session_state.global_holidays_np = np.array([], dtype='datetime64[D]')
     
     if 'processes_df' not in st.session_state:
+        # 불변식: processes_df는 항상 Order 오름차순으로 유지 (쓰기 시점에만 정렬)
         st.session_state.processes_df = get_default_processes_df()
     
     if 'team_settings' not in st.session_state:
-        st.session_state.team_settings = {}
-        # 초기 팀 설정 생성
-        for _, proc_row in st.session_state.processes_df.iterrows():
-            team_code = proc_row['Team Code']
-            if team_code not in st.session_state.team_settings:
-                st.session_state.team_settings[team_code] = {
-                    'work_weekdays': [0, 1, 2, 3, 4, 5],  # 기본값: 월~토
-                    'team_holidays': set()
-                }
+        # 초기 팀 설정 생성 (행 순회 대신 팀 코드 고유값으로 한 번에 구성)
+        st.session_state.team_settings = {
+            team_code: {
+                'work_weekdays': [0, 1, 2, 3, 4, 5],  # 기본값: 월~토
+                'team_holidays': set()
+            }
+            for team_code in st.session_state.processes_df['Team Code'].unique()
+        }
     
     if 'df_raw' not in st.session_state:
         st.session_state.df_raw = None
     
     if 'projects_db' not in st.session_state:
         st.session_state.projects_db = {}  # Key: Project_No, Value: DataFrame (블록 리스트)
-    
+
+    if 'projects_db_version' not in st.session_state:
+        st.session_state.projects_db_version = 0  # projects_db 쓰기 시마다 증가 (통합 캐시 키)
+
     if 'project_capa' not in st.session_state:
         st.session_state.project_capa = {}  # Key: (Project_No, Process_Name) 튜플, Value: Monthly_CAPA_Ton
 
+    if 'holidays_total' not in st.session_state:
+        st.session_state.holidays_total = 0  # 홈 화면 지표용 휴무일 합계 (변경 시점에만 갱신)
+
+def refresh_holidays_total():
+    """공통+팀별 휴무일 합계를 세션에 캐시 (휴무일이 바뀐 시점에만 호출)"""
+    total = len(st.session_state.global_holidays)
+    for team_setting in st.session_state.team_settings.values():
+        total += len(team_setting.get('team_holidays', set()))
+    st.session_state.holidays_total = total
+
 def get_app_title():
     """회사명 기반 앱 타이틀 반환"""
     company_name = st.session_state.get("company_info", {}).get("company_name", "").strip()
@@ -96,14 +146,17 @@ def apply_browser_title(title):
 # ============================================================================
 # 기본 공정 데이터프레임 생성
 # ============================================================================
+@st.cache_data
 def get_default_processes_df():
-    """기본 공정 리스트를 데이터프레임으로 반환"""
+    """기본 공정 리스트를 데이터프레임으로 반환 (cache_data가 호출마다 복사본 제공)"""
     default_data = {
         'Process Name': ['절단', '취부', '용접', '사상', '조립검사', '도장', '도장검사', 'PND', '납기'],
         'Type': ['Duration', 'Duration', 'Duration', 'Duration', 'Milestone', 'Duration', 'Milestone', 'Milestone', 'Milestone'],
         'Order': [1, 2, 3, 4, 5, 6, 7, 8, 9],
         'Team Code': ['cutting', 'fitting', 'welding', 'sandblasting', 'assembly_inspection', 'painting', 'painting_inspection', 'pnd', 'final']
     }
+    # 문자열 컬럼은 object 그대로 유지 — 범주형은 data_editor 셀 편집 시
+    # 새 값 입력이 불가능하고(기존 카테고리 외 값 거부), 이 크기에서는 이득이 없음
     return pd.DataFrame(default_data)
 
 # ============================================================================
@@ -111,7 +164,11 @@ def get_default_processes_df():
 # ============================================================================
 @st.cache_data
 def generate_date_list(start_date=None, end_date=None):
-    """날짜 리스트 생성 (YYYY-MM-DD (요일) 형식)"""
+    """날짜 리스트 생성 (YYYY-MM-DD (요일) 형식)
+
+    캐시 키에 시작일이 포함되도록 호출부에서 date.today()를 넘겨야
+    날짜가 바뀐 뒤에도 이전 날짜의 목록이 재사용되지 않는다.
+    """
     if start_date is None:
         start_date = date.today()
     if end_date is None:
@@ -119,26 +176,33 @@ def generate_date_list(start_date=None, end_date=None):
         one_year_later = start_date + timedelta(days=365)
         end_date = max(end_2026, one_year_later)
     
-    date_list = []
-    current_date = start_date
-    
-    while current_date <= end_date:
-        weekday_name = WEEKDAY_NAMES[current_date.weekday()]
-        date_str = f"{current_date.strftime('%Y-%m-%d')} ({weekday_name})"
-        date_list.append(date_str)
-        current_date += timedelta(days=1)
-    
-    return date_list
+    # 날짜 생성과 문자열 포맷을 벡터 연산으로 처리 (파이썬 루프 제거)
+    date_range = pd.date_range(start_date, end_date, freq='D')
+    weekday_names = np.array(WEEKDAY_NAMES)[date_range.weekday]
+    date_list = date_range.strftime('%Y-%m-%d').values + ' (' + weekday_names + ')'
+
+    # 불변 튜플로 반환 (캐시 저장/조회가 가볍고 호출자 측 변형도 차단)
+    return tuple(date_list)
+
+def date_strings_to_dates(date_strings):
+    """'YYYY-MM-DD (요일)' 문자열 모음을 date 리스트로 일괄 변환"""
+    if len(date_strings) == 0:
+        return []
+    parsed = pd.to_datetime(pd.Index(date_strings).str[:10], format="%Y-%m-%d")
+    return [d.date() for d in parsed]
+
+def dates_to_date_strings(dates):
+    """date 객체 모음을 'YYYY-MM-DD (요일)' 문자열 리스트로 일괄 변환"""
+    if len(dates) == 0:
+        return []
+    idx = pd.DatetimeIndex(pd.to_datetime(list(dates)))
+    weekday_names = np.array(WEEKDAY_NAMES)[idx.weekday]
+    return (idx.strftime('%Y-%m-%d').values + ' (' + weekday_names + ')').tolist()
 
-def date_string_to_date(date_str):
-    """'2026-05-05 (화)' 형식의 문자열을 date 객체로 변환"""
-    date_part = date_str.split(' (')[0]
-    return datetime.strptime(date_part, "%Y-%m-%d").date()
-
-def date_to_date_string(d):
-    """date 객체를 'YYYY-MM-DD (요일)' 형식의 문자열로 변환"""
-    weekday_name = WEEKDAY_NAMES[d.weekday()]
-    return f"{d.strftime('%Y-%m-%d')} ({weekday_name})"
+@st.cache_data
+def stringify_holidays(holidays_key):
+    """정렬된 휴무일 튜플을 multiselect 기본값 문자열로 변환 (rerun 간 캐시)"""
+    return dates_to_date_strings(holidays_key)
 
 # ============================================================================
 # NumPy 기반 날짜 계산 함수
@@ -150,75 +214,163 @@ def work_weekdays_to_weekmask(work_weekdays):
         weekmask[day] = '1'
     return ''.join(weekmask)
 
-def holidays_to_numpy_array(global_holidays, team_holidays):
-    """휴무일 세트를 NumPy 배열로 변환"""
-    all_holidays = global_holidays.union(team_holidays)
-    if not all_holidays:
+def holiday_set_to_array(holidays_set):
+    """휴무일 세트를 정렬된 datetime64[D] 배열로 변환 (편집 시점에 한 번만 호출)"""
+    if not holidays_set:
         return np.array([], dtype='datetime64[D]')
-    return np.array(sorted(all_holidays), dtype='datetime64[D]')
+    arr = np.fromiter(holidays_set, dtype='datetime64[D]', count=len(holidays_set))
+    # np.busday_offset는 정렬되고 중복 없는 휴무일 배열을 요구
+    return np.unique(arr)
 
-def is_work_day_numpy(date_np, weekmask, holidays):
-    """NumPy를 사용하여 특정 날짜가 작업일인지 확인"""
-    if date_np in holidays:
-        return False
-    weekday = pd.Timestamp(date_np).weekday()
-    return weekmask[weekday] == '1'
+def holidays_to_numpy_array(global_holidays, team_holidays):
+    """휴무일 모음(세트 또는 이미 변환된 배열)을 하나의 NumPy 배열로 병합"""
+    if not isinstance(global_holidays, np.ndarray):
+        global_holidays = holiday_set_to_array(global_holidays)
+    if not isinstance(team_holidays, np.ndarray):
+        team_holidays = holiday_set_to_array(team_holidays)
+    if len(team_holidays) == 0:
+        return global_holidays
+    if len(global_holidays) == 0:
+        return team_holidays
+    return np.union1d(global_holidays, team_holidays)
+
+# 기본 근무 설정(월~토 근무, 휴무일 없음)은 모든 팀이 공유하는 캘린더 하나로 충분
+DEFAULT_WEEKMASK = '1111110'
+DEFAULT_BUSDAYCAL = np.busdaycalendar(weekmask=DEFAULT_WEEKMASK)
+
+def build_busday_calendar(weekmask, holidays):
+    """weekmask/휴무일로 np.busdaycalendar 생성 (근무 요일이 없으면 None)"""
+    if '1' not in weekmask:
+        return None
+    if weekmask == DEFAULT_WEEKMASK and len(holidays) == 0:
+        # 가장 흔한 기본 설정은 캘린더를 새로 만들지 않고 재사용
+        return DEFAULT_BUSDAYCAL
+    return np.busdaycalendar(weekmask=weekmask, holidays=holidays)
+
+@st.cache_resource
+def get_team_busday_calendar(weekmask, holidays_key):
+    """동일한 (weekmask, 휴무일) 조합의 캘린더를 rerun/세션 간에 공유"""
+    holidays = np.array(holidays_key, dtype='datetime64[D]')
+    return build_busday_calendar(weekmask, holidays)
+
+def build_team_calendar_cache(processes_df, team_settings, global_holidays):
+    """팀코드별 busdaycalendar 캐시를 한 번만 생성
+
+    np.busdaycalendar는 weekmask와 휴무일 배열을 내부적으로 정규화해 두므로
+    이후의 모든 busday_offset 호출이 사전 계산된 구조를 재사용한다.
+    """
+    team_cache = {}
+    for team_code in processes_df['Team Code']:
+        if team_code in team_cache:
+            continue
+        team_setting = team_settings.get(team_code, {
+            'work_weekdays': [0, 1, 2, 3, 4, 5],
+            'team_holidays': set()
+        })
+        work_weekdays = team_setting.get('work_weekdays', [0, 1, 2, 3, 4, 5])
+        # 편집 시점에 미리 변환된 배열이 있으면 세트 변환을 건너뜀
+        team_holidays = team_setting.get(
+            'team_holidays_np', team_setting.get('team_holidays', set())
+        )
+        holidays = holidays_to_numpy_array(global_holidays, team_holidays)
+        team_cache[team_code] = get_team_busday_calendar(
+            work_weekdays_to_weekmask(work_weekdays),
+            tuple(holidays.tolist())
+        )
+    return team_cache
 
-def add_business_days_numpy(end_date, days, work_weekdays, global_holidays, team_holidays):
-    """NumPy를 사용하여 주말과 휴일을 제외하고 지정된 일수만큼 날짜를 역산"""
-    if days == 0:
-        return end_date
-    
-    weekmask = work_weekdays_to_weekmask(work_weekdays)
-    holidays = holidays_to_numpy_array(global_holidays, team_holidays)
-    end_date_np = np.datetime64(end_date.date())
-    
-    current_date = end_date_np
-    days_counted = 0
-    max_iterations = 365 * 2
-    iteration = 0
-    
-    while days_counted < days and iteration < max_iterations:
-        current_date -= np.timedelta64(1, 'D')
-        if is_work_day_numpy(current_date, weekmask, holidays):
-            days_counted += 1
-        iteration += 1
-    
-    if iteration >= max_iterations:
-        raise ValueError(f"작업일을 찾을 수 없습니다. 날짜 범위를 확인하세요.")
-    
-    return pd.Timestamp(current_date)
-
-def add_business_days_forward_numpy(start_date, days, work_weekdays, global_holidays, team_holidays):
-    """NumPy를 사용하여 주말과 휴일을 제외하고 지정된 일수만큼 날짜를 순산"""
-    if days <= 0:
-        return start_date
-
-    weekmask = work_weekdays_to_weekmask(work_weekdays)
-    holidays = holidays_to_numpy_array(global_holidays, team_holidays)
-    start_date_np = np.datetime64(pd.Timestamp(start_date).date())
-
-    current_date = start_date_np
-    days_counted = 0
-    max_iterations = 365 * 2
-    iteration = 0
-
-    while days_counted < days and iteration < max_iterations:
-        if is_work_day_numpy(current_date, weekmask, holidays):
-            days_counted += 1
-            if days_counted == days:
-                break
-        current_date += np.timedelta64(1, 'D')
-        iteration += 1
-
-    if iteration >= max_iterations:
+def _require_calendar(calendar):
+    """근무 요일이 전혀 없는 팀 설정에 대한 공통 가드"""
+    if calendar is None:
         raise ValueError("작업일을 찾을 수 없습니다. 날짜 범위를 확인하세요.")
 
-    return pd.Timestamp(current_date)
+def add_business_days_array(end_dates, days, calendar):
+    """datetime64[D] 배열 전체에 대해 작업일 기준 역산 (행 단위 호출 없이 한 번에 계산)"""
+    _require_calendar(calendar)
+
+    days = np.asarray(days)
+    result = np.busday_offset(end_dates, -days, roll='forward', busdaycal=calendar)
+    if np.any(days == 0):
+        # 소요일수 0은 기준일을 그대로 유지 (스칼라 버전과 동일한 규칙)
+        result = np.where(days == 0, end_dates, result)
+    return result
+
+def add_business_days_forward_array(start_dates, days, calendar):
+    """datetime64[D] 배열 전체에 대해 작업일 기준 순산"""
+    _require_calendar(calendar)
+
+    days = np.asarray(days)
+    result = np.busday_offset(
+        start_dates, np.maximum(days - 1, 0), roll='forward', busdaycal=calendar
+    )
+    if np.any(days <= 0):
+        result = np.where(days <= 0, start_dates, result)
+    return result
 
 # ============================================================================
 # 동적 역산 스케줄링 엔진
 # ============================================================================
+@st.cache_data
+def get_processes_records(processes_df):
+    """Order 순으로 정렬된 공정 레코드 튜플 (공정 리스트가 바뀔 때만 재계산)"""
+    return tuple(processes_df.sort_values('Order').to_dict('records'))
+
+def unpack_process_steps(processes_sorted):
+    """공정 레코드를 루프에서 바로 언패킹할 (이름, 유형, 팀코드) 튜플로 변환"""
+    return [
+        (process['Process Name'], process['Type'], process['Team Code'])
+        for process in processes_sorted
+    ]
+
+def extract_duration_days(df, processes_sorted):
+    """Duration 공정 소요일수를 단일 행렬로 추출 (없는 컬럼/빈 값은 기본값 5일)"""
+    duration_names = [
+        process['Process Name'] for process in processes_sorted
+        if process['Type'] == 'Duration'
+    ]
+    days_matrix = (
+        df.reindex(columns=[f"{name}_Days" for name in duration_names])
+        .fillna(5)
+        .astype(np.int64)
+        .values
+    )
+    return {name: days_matrix[:, i] for i, name in enumerate(duration_names)}
+
+def calculate_forward_schedule(df, processes_df, team_settings, global_holidays,
+                               start_date):
+    """모든 행을 start_date부터 순산했을 때의 최종 공정 완료일 배열을 반환
+
+    역산 결과와 결합하면 착수 여유(slack)와 지연 블록의 실제 완료 예상일을
+    구할 수 있다. 역산 엔진과 동일한 배열 연산을 정방향으로 수행한다.
+    """
+    processes_sorted = get_processes_records(processes_df)
+    team_cache = build_team_calendar_cache(processes_df, team_settings, global_holidays)
+    days_by_process = extract_duration_days(df, processes_sorted)
+
+    n_rows = len(df)
+    current_ref = np.full(
+        n_rows, np.datetime64(pd.Timestamp(start_date).date()), dtype='datetime64[D]'
+    )
+    last_end_dates = current_ref
+
+    for process_name, process_type, team_code in unpack_process_steps(processes_sorted):
+        if process_name == '납기':
+            continue
+
+        calendar = team_cache[team_code]
+
+        if process_type == 'Milestone':
+            milestone_dates = add_business_days_forward_array(current_ref, 1, calendar)
+            last_end_dates = milestone_dates
+            current_ref = milestone_dates + ONE_DAY_NP
+        elif process_type == 'Duration':
+            days = days_by_process[process_name]
+            end_dates = add_business_days_forward_array(current_ref, days, calendar)
+            last_end_dates = end_dates
+            current_ref = end_dates + ONE_DAY_NP
+
+    return last_end_dates
+
 def calculate_backward_schedule(df, processes_df, team_settings, global_holidays):
     """
     동적 역산 스케줄링 계산 엔진
@@ -226,124 +378,664 @@ def calculate_backward_schedule(df, processes_df, team_settings, global_holidays
     - team_settings: 팀별 설정 딕셔너리 (Team Code를 키로 사용)
     - global_holidays: 공통 휴무일 세트
     """
-    df = df.copy()
-    df["비고"] = ""
-    df["Forward_Delay_Days"] = 0
-    
+    # 입력 df는 변경하지 않는다: 새로 만드는 컬럼만 모아 마지막에 assign
+    new_cols = {}
+    remark = np.full(len(df), "", dtype=object)
+    forward_delay = np.zeros(len(df), dtype=np.int64)
+
     # 공정 리스트를 Order 순서대로 정렬하고 역순으로 변환
-    processes_sorted = processes_df.sort_values('Order').to_dict('records')
-    processes_reversed = list(reversed(processes_sorted))
-    
-    # 각 행에 대해 역산 스케줄링 계산
-    for idx, row in df.iterrows():
-        # 납기일 찾기
-        final_date = pd.to_datetime(row["납기일(Final_Date)"])
-
-        fixed_start_date = row.get("Fixed_Start_Date", None)
-        if pd.notna(fixed_start_date) and str(fixed_start_date).strip() != "":
-            df.at[idx, "비고"] = "📅사용자 지정"
-            fixed_start_date = pd.to_datetime(fixed_start_date)
-
-            current_reference_date = fixed_start_date
-            last_end_date = None
-
-            for process in processes_sorted:
-                process_name = process['Process Name']
-                process_type = process['Type']
-                team_code = process['Team Code']
-
-                if process_name == '납기':
-                    df.at[idx, "납기일(Final_Date)"] = final_date
-                    continue
+    processes_sorted = get_processes_records(processes_df)
+    # 루프마다 딕셔너리 키 조회 대신 튜플 언패킹을 쓰도록 한 번만 변환
+    process_steps = unpack_process_steps(processes_sorted)
+
+    # 팀별 weekmask/휴무일 배열은 행 루프 밖에서 한 번만 생성
+    team_cache = build_team_calendar_cache(processes_df, team_settings, global_holidays)
+
+    n_rows = len(df)
+
+    # 납기일을 datetime64[D] 배열로 한 번만 변환
+    final_series = pd.to_datetime(df["납기일(Final_Date)"])
+    new_cols["납기일(Final_Date)"] = final_series
+    final_dates = final_series.values.astype('datetime64[D]')
+
+    # 사용자 지정 착수일이 있는 행 분리 (순산), 나머지는 역산 대상
+    # datetime64[D]로 한 번만 변환해 마스크와 순산 기준일에 모두 재사용
+    if "Fixed_Start_Date" in df.columns:
+        fixed_start_dates = pd.to_datetime(
+            df["Fixed_Start_Date"], errors='coerce'
+        ).values.astype('datetime64[D]')
+        fixed_mask = ~np.isnat(fixed_start_dates)
+    else:
+        fixed_start_dates = None
+        fixed_mask = np.zeros(n_rows, dtype=bool)
 
-                team_setting = team_settings.get(team_code, {
-                    'work_weekdays': [0, 1, 2, 3, 4, 5],
-                    'team_holidays': set()
-                })
-                work_weekdays = team_setting.get('work_weekdays', [0, 1, 2, 3, 4, 5])
-                team_holidays = team_setting.get('team_holidays', set())
+    days_by_process = extract_duration_days(df, processes_sorted)
 
-                if process_type == 'Milestone':
-                    milestone_date = add_business_days_forward_numpy(
-                        current_reference_date, 1, work_weekdays, global_holidays, team_holidays
-                    )
-                    df.at[idx, f"{process_name}일"] = milestone_date
-                    last_end_date = milestone_date
-                    current_reference_date = milestone_date + pd.Timedelta(days=1)
-                elif process_type == 'Duration':
-                    days_col = f"{process_name}_Days"
-                    if days_col not in row or pd.isna(row[days_col]):
-                        days = 5
-                    else:
-                        days = int(row[days_col])
+    # 출력 컬럼 준비 (전체 길이 배열을 만들어 필요한 행만 채움)
+    result_cols = {}
 
-                    start_date = pd.to_datetime(current_reference_date)
-                    end_date = add_business_days_forward_numpy(
-                        start_date, days, work_weekdays, global_holidays, team_holidays
-                    )
+    def _result_col(col):
+        if col not in result_cols:
+            result_cols[col] = np.full(n_rows, np.datetime64('NaT'), dtype='datetime64[D]')
+        return result_cols[col]
 
-                    df.at[idx, f"{process_name}_Start"] = start_date
-                    df.at[idx, f"{process_name}_End"] = end_date
-                    last_end_date = end_date
-                    current_reference_date = end_date + pd.Timedelta(days=1)
+    # ------------------------------------------------------------------
+    # 역산 스케줄링: 전체 행을 공정 단위로 한 번에 계산 (np.busday_offset 배열 호출)
+    # ------------------------------------------------------------------
+    backward_idx = np.flatnonzero(~fixed_mask)
+    if len(backward_idx) > 0:
+        current_ref = final_dates[backward_idx]
 
-            if last_end_date is not None and last_end_date > final_date:
-                df.at[idx, "Forward_Delay_Days"] = int((last_end_date - final_date).days)
-            continue
-        
-        # 역순으로 공정 순회
-        current_reference_date = final_date
-        
-        for process in processes_reversed:
-            process_name = process['Process Name']
-            process_type = process['Type']
-            team_code = process['Team Code']
-            
+        for process_name, process_type, team_code in reversed(process_steps):
             # 납기와 PND는 특별 처리
             if process_name == '납기':
-                df.at[idx, "납기일(Final_Date)"] = final_date
                 continue
             elif process_name == 'PND':
-                pnd_date = final_date - pd.Timedelta(days=1)
-                df.at[idx, "PND"] = pnd_date
-                current_reference_date = pnd_date
+                # PND = 직전 기준일의 하루 전. 기본 공정 순서(납기 바로 앞)에서는
+                # 과거 구현의 '납기일 - 1일'과 동일하지만, 관리자가 납기와 PND 사이에
+                # 공정을 끼워 넣어도 체인이 끊기지 않도록 기준일에서 이어 계산한다.
+                pnd_dates = current_ref - ONE_DAY_NP
+                _result_col("PND")[backward_idx] = pnd_dates
+                current_ref = pnd_dates
                 continue
-            
-            # 팀 설정 가져오기
-            team_setting = team_settings.get(team_code, {
-                'work_weekdays': [0, 1, 2, 3, 4, 5],
-                'team_holidays': set()
-            })
-            work_weekdays = team_setting.get('work_weekdays', [0, 1, 2, 3, 4, 5])
-            team_holidays = team_setting.get('team_holidays', set())
-            
+
+            # 팀별 캐시에서 weekmask/휴무일 가져오기
+            calendar = team_cache[team_code]
+
             if process_type == 'Milestone':
                 # 마일스톤: 현재 기준일의 전날에서 작업일 기준으로 1일 역산
-                prev_day = current_reference_date - pd.Timedelta(days=1)
-                milestone_date = add_business_days_numpy(
-                    prev_day, 1, work_weekdays, global_holidays, team_holidays
+                milestone_dates = add_business_days_array(
+                    current_ref - ONE_DAY_NP, 1, calendar
                 )
-                df.at[idx, f"{process_name}일"] = milestone_date
-                current_reference_date = milestone_date
-                
+                _result_col(f"{process_name}일")[backward_idx] = milestone_dates
+                current_ref = milestone_dates
+
             elif process_type == 'Duration':
                 # Duration: 종료일 = 현재 기준일의 전날, 시작일 = 종료일에서 소요일수 역산
-                days_col = f"{process_name}_Days"
-                if days_col not in row or pd.isna(row[days_col]):
-                    days = 5  # 기본값
-                else:
-                    days = int(row[days_col])
-                
-                end_date = current_reference_date - pd.Timedelta(days=1)
-                start_date = add_business_days_numpy(
-                    end_date, days, work_weekdays, global_holidays, team_holidays
+                days = days_by_process[process_name][backward_idx]
+                end_dates = current_ref - ONE_DAY_NP
+                start_dates = add_business_days_array(
+                    end_dates, days, calendar
                 )
-                
-                df.at[idx, f"{process_name}_Start"] = start_date
-                df.at[idx, f"{process_name}_End"] = end_date
-                current_reference_date = start_date
-    
-    return df
+                _result_col(f"{process_name}_Start")[backward_idx] = start_dates
+                _result_col(f"{process_name}_End")[backward_idx] = end_dates
+                current_ref = start_dates
+
+    # ------------------------------------------------------------------
+    # 사용자 지정 착수일 행: 동일한 배열 연산으로 순산
+    # ------------------------------------------------------------------
+    fixed_idx = np.flatnonzero(fixed_mask)
+    if len(fixed_idx) > 0:
+        remark[fixed_idx] = "📅사용자 지정"
+
+        current_ref = fixed_start_dates[fixed_idx]
+        last_end_dates = None
+
+        for process_name, process_type, team_code in process_steps:
+            if process_name == '납기':
+                continue
+
+            calendar = team_cache[team_code]
+
+            if process_type == 'Milestone':
+                milestone_dates = add_business_days_forward_array(
+                    current_ref, 1, calendar
+                )
+                _result_col(f"{process_name}일")[fixed_idx] = milestone_dates
+                last_end_dates = milestone_dates
+                current_ref = milestone_dates + ONE_DAY_NP
+            elif process_type == 'Duration':
+                days = days_by_process[process_name][fixed_idx]
+                start_dates = current_ref
+                end_dates = add_business_days_forward_array(
+                    start_dates, days, calendar
+                )
+                _result_col(f"{process_name}_Start")[fixed_idx] = start_dates
+                _result_col(f"{process_name}_End")[fixed_idx] = end_dates
+                last_end_dates = end_dates
+                current_ref = end_dates + ONE_DAY_NP
+
+        if last_end_dates is not None:
+            delay_days = (last_end_dates - final_dates[fixed_idx]).astype(np.int64)
+            forward_delay[fixed_idx] = np.maximum(delay_days, 0)
+
+    new_cols["비고"] = remark
+    new_cols["Forward_Delay_Days"] = forward_delay
+    for col, arr in result_cols.items():
+        new_cols[col] = pd.to_datetime(arr)
+
+    # assign은 기존 컬럼 배열을 복사하지 않고 새 컬럼만 붙인 프레임을 반환
+    return df.assign(**new_cols)
+
+def freeze_holidays(holidays_set, holidays_np=None):
+    """휴무일 집합을 캐시 키용 정렬 튜플로 변환 (정렬된 배열이 있으면 그대로 사용)"""
+    if holidays_np is not None:
+        return tuple(holidays_np.tolist())
+    return tuple(sorted(holidays_set))
+
+def freeze_team_settings(team_settings):
+    """팀 설정 딕셔너리를 캐시 키로 쓸 수 있는 정렬된 튜플로 변환"""
+    return tuple(sorted(
+        (team_code,
+         tuple(setting.get('work_weekdays', [0, 1, 2, 3, 4, 5])),
+         freeze_holidays(
+             setting.get('team_holidays', set()),
+             setting.get('team_holidays_np')
+         ))
+        for team_code, setting in team_settings.items()
+    ))
+
+@st.cache_data
+def calculate_backward_schedule_cached(df, processes_df, team_settings_frozen,
+                                       global_holidays_frozen):
+    """입력이 바뀌지 않은 rerun에서는 스케줄을 재계산하지 않는 캐시 래퍼"""
+    team_settings = {
+        team_code: {
+            'work_weekdays': list(work_weekdays),
+            'team_holidays': set(team_holidays)
+        }
+        for team_code, work_weekdays, team_holidays in team_settings_frozen
+    }
+    return calculate_backward_schedule(
+        df, processes_df, team_settings, set(global_holidays_frozen)
+    )
+
+# ============================================================================
+# 프로젝트 DB 통합 (스케줄링 엔진 입력 형식으로 변환)
+# ============================================================================
+@st.cache_data(show_spinner=False)
+def integrate_projects_db(version, processes_records, _projects_db):
+    """등록된 프로젝트들을 스케줄링 엔진 입력 형식으로 통합.
+
+    version은 projects_db 쓰기 시마다 증가하므로, 데이터가 바뀌지 않은
+    rerun에서는 concat 없이 캐시된 통합 결과를 그대로 재사용한다.
+    """
+    final_df = pd.concat(
+        list(_projects_db.values()), ignore_index=True
+    ).rename(columns={
+        'Project_No': '프로젝트명',
+        'Block_No': '블록명',
+        'Weight': '중량(Ton)',
+        'Delivery_Date': '납기일(Final_Date)'
+    })
+    if 'Fixed_Start_Date' not in final_df.columns:
+        final_df['Fixed_Start_Date'] = pd.NaT
+
+    # Duration 공정의 Days 컬럼이 없으면 기본값 추가
+    duration_names = [
+        p['Process Name'] for p in processes_records if p['Type'] == 'Duration'
+    ]
+    missing_days_cols = [
+        f"{name}_Days" for name in duration_names
+        if f"{name}_Days" not in final_df.columns
+    ]
+    if missing_days_cols:
+        final_df[missing_days_cols] = np.int16(5)
+
+    # 1~100 범위 일수와 소수 1자리 중량에 64비트는 과함 - 통합 시 다운캐스트
+    days_cols = [f"{name}_Days" for name in duration_names]
+    if days_cols:
+        final_df[days_cols] = final_df[days_cols].fillna(5).astype('int16')
+    final_df['중량(Ton)'] = final_df['중량(Ton)'].astype('float32')
+
+    # 최종 컬럼 선택 (스케줄링 엔진에 필요한 컬럼만)
+    final_columns = ['프로젝트명', '블록명', '중량(Ton)', '납기일(Final_Date)', 'Fixed_Start_Date']
+    final_columns += [f"{name}_Days" for name in duration_names]
+    return final_df[final_columns]
+
+@st.cache_data(show_spinner=False)
+def combine_projects_db(version, _projects_db):
+    """프로젝트 DB를 원본 컬럼 그대로 하나의 프레임으로 결합.
+
+    실시간 수정 탭이 사용하는 결합 프레임으로, 버전이 같은 rerun에서는
+    concat을 건너뛰고 캐시된 결과의 복사본을 돌려준다. 블록 검색용
+    소문자 컬럼도 여기서 한 번만 만들어 검색 키 입력마다 재변환하지 않는다.
+    """
+    combined = pd.concat(list(_projects_db.values()), ignore_index=True)
+    if len(combined):
+        combined['_block_no_lower'] = combined['Block_No'].astype('string').str.lower()
+    return combined
+
+@st.cache_data(show_spinner=False)
+def build_project_display_df(version, project_no, _project_df):
+    """프로젝트 목록 expander용 표시 프레임 (버전이 같으면 날짜 변환 생략)"""
+    if 'Delivery_Date' in _project_df.columns:
+        return _project_df.assign(
+            Delivery_Date=_project_df['Delivery_Date'].dt.date
+        )
+    return _project_df
+
+def apply_realtime_edits(edited_df, original_df):
+    """실시간 에디터의 변경 셀만 projects_db에 반영하고 변경 여부를 반환.
+
+    편집본과 원본을 한 번에 비교해 변경 셀 마스크를 만든 뒤, 프로젝트별로
+    Block_No → 행 위치 매핑으로 대상 행을 찾아 변경된 값만 쓴다.
+    셀마다 블록을 다시 검색하던 이전 방식과 달리 행 수에 선형으로 동작한다.
+    """
+    value_cols = [
+        col for col in edited_df.columns
+        if col == 'Fixed_Start_Date' or col.endswith('_Days')
+    ]
+    if not value_cols:
+        return False
+
+    edited_values = edited_df[value_cols]
+    original_values = original_df[value_cols]
+    changed_mask = edited_values.ne(original_values) & ~(
+        edited_values.isna() & original_values.isna()
+    )
+    # Days 컬럼은 값을 지운(NaN) 셀을 덮어쓰지 않는다 (기존 저장 규칙 유지)
+    for col in value_cols:
+        if col != 'Fixed_Start_Date':
+            changed_mask[col] &= edited_values[col].notna()
+    changed_rows = changed_mask.any(axis=1)
+    if not changed_rows.any():
+        return False
+
+    changes_made = False
+    changes = edited_df.loc[changed_rows]
+    changes_mask = changed_mask.loc[changed_rows]
+    for project_no, group in changes.groupby('Project_No', sort=False):
+        project_df = st.session_state.projects_db.get(project_no)
+        if project_df is None:
+            continue
+
+        # Block_No → 행 위치 매핑 (중복 블록명은 첫 행 기준)
+        block_pos = pd.Series(
+            np.arange(len(project_df)), index=pd.Index(project_df['Block_No'])
+        )
+        block_pos = block_pos[~block_pos.index.duplicated(keep='first')]
+        row_pos = (
+            block_pos.reindex(group['Block_No']).fillna(-1).astype('int64').to_numpy()
+        )
+        found = row_pos >= 0
+        if not found.any():
+            continue
+
+        group_mask = changes_mask.loc[group.index]
+        for col in value_cols:
+            cell_mask = group_mask[col].to_numpy() & found
+            if not cell_mask.any():
+                continue
+            if col == 'Fixed_Start_Date':
+                if col not in project_df.columns:
+                    project_df[col] = pd.NaT
+                new_values = pd.to_datetime(
+                    group[col], errors='coerce'
+                ).to_numpy()[cell_mask]
+            elif col in project_df.columns:
+                new_values = group[col].to_numpy()[cell_mask].astype('int64')
+            else:
+                continue
+            col_pos = project_df.columns.get_loc(col)
+            project_df.iloc[row_pos[cell_mask], col_pos] = new_values
+            changes_made = True
+
+    return changes_made
+
+# ============================================================================
+# 엑셀 생성 헬퍼 (다운로드 버튼용, 입력이 같으면 캐시된 바이트 재사용)
+# ============================================================================
+def build_dynamic_columns(processes_df):
+    """공정 유형별 동적 컬럼명(…_Days/…_Date)을 행 순회 없이 한 번에 생성"""
+    suffixes = processes_df['Type'].map(
+        {'Duration': '_Days', 'Milestone': '_Date'}
+    )
+    return [
+        f"{name}{suffix}"
+        for name, suffix in zip(processes_df['Process Name'], suffixes)
+        if isinstance(suffix, str)
+    ]
+
+@st.cache_data(show_spinner=False)
+def build_template_bytes(template_columns):
+    """공정 구성(컬럼 튜플)별로 입력 양식 엑셀을 한 번만 생성"""
+    excel_buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(
+        excel_buffer, {'constant_memory': True, 'in_memory': True}
+    )
+    sheet = workbook.add_worksheet('Input_Data')
+    sheet.write_row(0, 0, template_columns)
+
+    # Fixed_Start_Date 헤더에 설명 추가
+    if 'Fixed_Start_Date' in template_columns:
+        sheet.write_comment(
+            0,
+            template_columns.index('Fixed_Start_Date'),
+            "입력 시 해당일부터 첫 공정 시작 (비워두면 납기일 기준 역산)",
+            {'author': 'System'}
+        )
+    workbook.close()
+    return excel_buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def build_integrated_csv_bytes(version, processes_records, _final_df):
+    """통합 데이터 CSV 바이트 생성 (projects_db 버전이 같으면 재직렬화 생략)"""
+    csv_buffer = io.BytesIO()
+    _final_df.to_csv(csv_buffer, index=False, encoding='utf-8-sig')
+    return csv_buffer.getvalue()
+
+@st.cache_data(show_spinner=False)
+def build_schedule_result_bytes(df_display):
+    """스케줄 결과 엑셀 생성 (결과가 바뀌지 않은 rerun에서는 재직렬화 생략)"""
+    excel_buffer = io.BytesIO()
+    workbook = xlsxwriter.Workbook(
+        excel_buffer, {'constant_memory': True, 'in_memory': True}
+    )
+    sheet = workbook.add_worksheet('Schedule_Result')
+    sheet.write_row(0, 0, list(df_display.columns))
+    # NaN은 빈 셀로 기록 (xlsxwriter는 None을 빈 셀로 처리)
+    export_df = df_display.astype(object).where(df_display.notna(), None)
+    for row_idx, row_values in enumerate(
+        export_df.itertuples(index=False, name=None), start=1
+    ):
+        sheet.write_row(row_idx, 0, row_values)
+    workbook.close()
+    return excel_buffer.getvalue()
+
+# ============================================================================
+# 에디터 컬럼 설정 헬퍼 (공정 구성이 같으면 위젯 설정 객체 재사용)
+# ============================================================================
+# 공정 에디터 컬럼 설정은 세션 상태와 무관한 순수 설정 객체라 모듈 수준에 한 번만 생성
+_PROCESSES_COLUMN_CONFIG = {
+    "Process Name": st.column_config.TextColumn(
+        "공정명",
+        required=True,
+        help="공정 이름을 입력하세요"
+    ),
+    "Type": st.column_config.SelectboxColumn(
+        "유형",
+        options=list(PROCESS_TYPE_VALUES.keys()),
+        required=True,
+        help="Duration: 기간 공정, Milestone: 특정일 공정"
+    ),
+    "Order": st.column_config.NumberColumn(
+        "순서",
+        min_value=1,
+        step=1,
+        required=True,
+        help="공정 순서 (낮을수록 먼저 실행)"
+    ),
+    "Team Code": st.column_config.TextColumn(
+        "팀코드",
+        required=True,
+        help="팀 설정과 연동할 코드 (영문 소문자 권장)"
+    )
+}
+
+@st.cache_resource
+def get_leadtime_column_config(duration_names):
+    """소요기간 에디터의 column_config 딕셔너리 생성 (rerun 간 재사용)"""
+    config = {
+        "Project_No": st.column_config.TextColumn("호선번호", disabled=True),
+        "Block_No": st.column_config.TextColumn("블록번호", disabled=True),
+        "Weight": st.column_config.NumberColumn("중량(Ton)", disabled=True),
+        "Delivery_Date": st.column_config.DateColumn("납기일", disabled=True),
+    }
+    for process_name in duration_names:
+        config[f"{process_name}_Days"] = st.column_config.NumberColumn(
+            f"{process_name} (일)",
+            min_value=1,
+            max_value=100,
+            step=1
+        )
+    return config
+
+# CAPA 에디터 컬럼 설정도 세션 상태와 무관한 고정 객체라 모듈 수준에 한 번만 생성
+_CAPA_COLUMN_CONFIG = {
+    "Process Name": st.column_config.TextColumn("공정명", disabled=True),
+    "Monthly CAPA (Ton)": st.column_config.NumberColumn(
+        "월간 목표 생산량 (Ton)",
+        min_value=0.0,
+        step=10.0,
+        format="%.1f"
+    )
+}
+
+@st.cache_resource
+def get_realtime_column_config(display_columns):
+    """실시간 수정 에디터의 column_config 딕셔너리 생성 (표시 컬럼이 같으면 재사용)"""
+    config = {
+        "Project_No": st.column_config.TextColumn("호선번호", disabled=True),
+        "Block_No": st.column_config.TextColumn("블록번호", disabled=True),
+        "Weight": st.column_config.NumberColumn("중량(Ton)", disabled=True),
+        "Delivery_Date": st.column_config.DateColumn("납기일", disabled=True),
+        "Fixed_Start_Date": st.column_config.DateColumn("지정 착수일"),
+    }
+    # 편집 가능한 Days 컬럼 설정
+    for col in display_columns:
+        if col.endswith('_Days'):
+            process_name = col.replace('_Days', '')
+            config[col] = st.column_config.NumberColumn(
+                f"{process_name} (일)",
+                min_value=1,
+                max_value=100,
+                step=1
+            )
+    return config
+
+@st.cache_data
+def get_process_option_labels(process_names, team_codes):
+    """공정 순서 이동 선택상자의 라벨 리스트 (공정 구성이 같으면 재사용)"""
+    return [
+        f"{idx + 1}. {name} ({team})"
+        for idx, (name, team) in enumerate(zip(process_names, team_codes))
+    ]
+
+# ============================================================================
+# 간트 차트 헬퍼
+# ============================================================================
+@st.cache_data(show_spinner=False)
+def build_gantt_figure(gantt_df, task_order):
+    """간트 차트 figure 생성 (스케줄 결과가 같은 rerun에서는 재구성 생략)"""
+    # plotly는 임포트가 무거워 실제로 figure를 만들 때만 로드
+    import plotly.express as px
+
+    # 날짜 범위 계산 (주말 음영 처리를 위해)
+    min_date = gantt_df['Start'].min().date()
+    max_date = gantt_df['Finish'].max().date()
+
+    # Plotly 간트 차트 생성
+    fig = px.timeline(
+        gantt_df,
+        x_start='Start',
+        x_end='Finish',
+        y='Task',
+        color='Process',
+        title='생산 스케줄 간트 차트',
+        hover_data=['Note'],
+        category_orders={'Task': task_order}
+    )
+
+    # 1. 격자선 및 배경 강화
+    # 주말 음영 처리 (토~일, 주 단위 날짜열에서 shapes를 한 번에 등록)
+    weekend_shapes = [
+        dict(
+            type="rect", xref="x", yref="y domain",
+            x0=saturday, x1=saturday + 2 * ONE_DAY,
+            y0=0, y1=1,
+            fillcolor="lightgray", opacity=0.2,
+            layer="below", line_width=0
+        )
+        for saturday in pd.date_range(min_date, max_date, freq='W-SAT')
+    ]
+    if weekend_shapes:
+        fig.update_layout(shapes=weekend_shapes)
+
+    # 2. 막대 디자인 개선
+    # 막대에 테두리 추가 및 스타일 개선
+    fig.update_traces(
+        marker_line_width=1,
+        marker_line_color='darkgray',
+        selector=dict(type='bar')
+    )
+
+    # 3. X축 설정 (1주일 간격, 날짜+요일 형식)
+    # 월요일 눈금 위치/라벨을 주 단위 날짜열로 한 번에 생성
+    monday_positions = list(pd.date_range(min_date, max_date, freq='W-MON'))
+    # "05-01(월)" 형식으로 라벨 생성
+    monday_labels = [
+        f"{monday.strftime('%m-%d')}({WEEKDAY_NAMES[monday.weekday()]})"
+        for monday in monday_positions
+    ]
+
+    fig.update_xaxes(
+        tickmode='array',
+        tickvals=monday_positions,
+        ticktext=monday_labels,
+        tickangle=-45,
+        showgrid=True,
+        gridwidth=2,
+        gridcolor='darkgray',
+        showline=True,
+        linewidth=2,
+        linecolor='black',
+        # 4. Range Slider 추가 (막대가 많으면 미니 차트 중복 렌더링이 커서 생략)
+        rangeslider_visible=len(gantt_df) < 500,
+        rangeslider_thickness=0.1
+    )
+
+    # Y축 설정 (가로선 추가)
+    fig.update_yaxes(
+        autorange="reversed",
+        showgrid=True,
+        gridwidth=1,
+        gridcolor='lightgray',
+        showline=True,
+        linewidth=1,
+        linecolor='black'
+    )
+
+    # 4. 레이아웃 개선
+    fig.update_layout(
+        height=600,
+        xaxis_title="날짜",
+        yaxis_title="프로젝트-블록",
+        plot_bgcolor='white',
+        paper_bgcolor='white',
+        hovermode='closest',
+        showlegend=True,
+        legend=dict(
+            orientation="h",
+            yanchor="bottom",
+            y=1.02,
+            xanchor="right",
+            x=1
+        )
+    )
+    return fig
+
+# ============================================================================
+# 부하 분석 헬퍼
+# ============================================================================
+@st.cache_data(show_spinner=False)
+def compute_period_load(df, start_col, end_col, days_col, freq):
+    """공정 한 개의 기간별 부하 합계를 일 단위 전개 없이 계산.
+
+    스케줄 결과와 기간 단위가 같은 rerun에서는 캐시된 집계를 재사용한다.
+
+    각 행의 구간이 걸치는 기간(주/월/연)을 ordinal 연산으로 나열하고,
+    기간마다 겹치는 일수 × 일별 부하(중량 ÷ 작업일수)를 바로 합산한다.
+    블록-일 단위 행을 만들지 않으므로 비용이 기간 수에만 비례한다.
+    유효한 구간이 없으면 None, 아니면 ['Period', 'Total_Load'] 프레임 반환.
+    """
+    start = pd.to_datetime(df[start_col])
+    end = pd.to_datetime(df[end_col])
+    span = (end - start).dt.days + 1
+
+    weight = pd.to_numeric(df.get('중량(Ton)', 0), errors='coerce').fillna(0.0)
+    if days_col in df.columns:
+        days = pd.to_numeric(df[days_col], errors='coerce').fillna(span)
+    else:
+        days = span
+
+    valid = start.notna() & end.notna() & (days > 0) & (span > 0)
+    if not valid.any():
+        return None
+
+    start_np = start[valid].to_numpy(dtype='datetime64[D]')
+    end_np = end[valid].to_numpy(dtype='datetime64[D]')
+    daily_load = (weight[valid] / days[valid]).to_numpy(dtype='float64')
+
+    # 행별로 걸치는 기간 ordinal을 repeat/arange로 한 번에 나열
+    start_ord = pd.PeriodIndex(start[valid], freq=freq).asi8
+    end_ord = pd.PeriodIndex(end[valid], freq=freq).asi8
+    n_periods = end_ord - start_ord + 1
+    offsets = np.arange(n_periods.sum()) - np.repeat(
+        np.cumsum(n_periods) - n_periods, n_periods
+    )
+    period_ord = np.repeat(start_ord, n_periods) + offsets
+    periods = pd.PeriodIndex.from_ordinals(period_ord, freq=freq)
+
+    # 기간 경계와 구간의 교집합 일수만큼 일별 부하를 싣는다
+    period_start = periods.start_time.to_numpy().astype('datetime64[D]')
+    period_end = periods.end_time.to_numpy().astype('datetime64[D]')
+    row_start = np.repeat(start_np, n_periods)
+    row_end = np.repeat(end_np, n_periods)
+    overlap_days = (
+        (np.minimum(row_end, period_end) - np.maximum(row_start, period_start))
+        / ONE_DAY_NP
+    ) + 1
+    load = np.repeat(daily_load, n_periods) * overlap_days
+
+    totals = pd.Series(load).groupby(period_ord).sum()
+    return pd.DataFrame({
+        'Period': pd.PeriodIndex.from_ordinals(
+            totals.index.to_numpy(), freq=freq
+        ).astype(str),
+        'Total_Load': totals.to_numpy(),
+    })
+
+@st.cache_data(show_spinner=False, max_entries=64)
+def build_load_figure(aggregated, total_capa, has_capa, process_name, time_scale):
+    """공정 부하율 차트 figure 생성 (집계 결과가 같은 rerun에서는 재구성 생략)
+
+    공정 수 × rerun마다 쌓이지 않도록 항목 수를 제한해 캐시한다.
+    """
+    # plotly는 임포트가 무거워 실제로 figure를 만들 때만 로드
+    import plotly.graph_objects as go
+
+    # 막대 그래프 (부하량, CAPA 초과 여부는 배열 비교 한 번으로 판정)
+    load_values = aggregated['Total_Load'].to_numpy()
+    if has_capa and total_capa > 0:
+        colors = np.where(load_values > total_capa, 'red', 'steelblue')
+    else:
+        colors = 'steelblue'
+
+    traces = [go.Bar(
+        x=aggregated['Period'],
+        y=aggregated['Total_Load'],
+        name='작업 물량',
+        marker_color=colors,
+        # 라벨은 이미 전송된 y값으로 브라우저가 포맷 (문자열 배열 미전송)
+        # 막대가 많으면 라벨 렌더링 자체를 생략 (hover로 확인 가능)
+        texttemplate='%{y:.1f} Ton' if len(aggregated) <= 200 else None,
+        textposition='outside'
+    )]
+
+    # CAPA 기준선 (수평선이라 양 끝 두 점이면 충분, N개 좌표 미전송)
+    if has_capa and total_capa > 0:
+        traces.append(go.Scatter(
+            x=[aggregated['Period'].iloc[0], aggregated['Period'].iloc[-1]],
+            y=[total_capa, total_capa],
+            mode='lines',
+            name=f'CAPA 기준선 ({total_capa:.1f} Ton)',
+            line=dict(color='orange', width=2, dash='dash'),
+            hovertemplate='CAPA: %{y:.1f} Ton<extra></extra>'
+        ))
+
+    # trace와 레이아웃을 한 번에 넘겨 중간 재검증 생략
+    return go.Figure(
+        data=traces,
+        layout=go.Layout(
+            title=f'{process_name} 공정 부하율 분석 ({time_scale})',
+            xaxis_title='기간',
+            yaxis_title='중량 (Ton)',
+            height=400,
+            hovermode='x unified',
+            showlegend=True
+        )
+    )
 
 # ============================================================================
 # 페이지 함수들
@@ -370,10 +1062,7 @@ def main_home():
             st.metric("등록된 프로젝트 수", 0)
     
     with col3:
-        total_holidays = len(st.session_state.global_holidays)
-        for team_setting in st.session_state.team_settings.values():
-            total_holidays += len(team_setting.get('team_holidays', set()))
-        st.metric("등록된 휴무일 수", total_holidays)
+        st.metric("등록된 휴무일 수", st.session_state.get("holidays_total", 0))
     
     st.divider()
     
@@ -405,25 +1094,22 @@ def main_home():
     - ✅ **간트 차트 + 부하율 분석**: 일정 시각화와 CAPA 대비 부하 확인
     """)
 
-def page_admin():
-    """공정 설정(Admin) 페이지"""
-    st.markdown("### ⚙️ 공정 설정 (Admin)")
-    st.caption("시스템에서 사용할 공정을 정의하고 관리합니다.")
-    
-    st.info("💡 공정을 추가/수정/삭제하면 다른 페이지에 즉시 반영됩니다.")
-
+@st.fragment
+def processes_admin_fragment():
+    """공정 순서/편집/목록 UI (셀 편집 시 전체 스크립트 대신 이 블록만 재실행)"""
     # 공정 순서 이동(드래그 대체)
     st.markdown("#### 🧭 공정 순서 이동")
     if "process_reorder_select_target" in st.session_state:
         st.session_state.process_reorder_select = st.session_state.pop(
             "process_reorder_select_target"
         )
-    processes_df = st.session_state.processes_df.sort_values('Order').reset_index(drop=True)
+    # processes_df는 항상 Order 순으로 저장되는 불변식이라 읽기 시 재정렬하지 않음
+    processes_df = st.session_state.processes_df
     if len(processes_df) > 0:
-        option_labels = [
-            f"{idx + 1}. {row['Process Name']} ({row['Team Code']})"
-            for idx, row in processes_df.iterrows()
-        ]
+        option_labels = get_process_option_labels(
+            tuple(processes_df['Process Name']),
+            tuple(processes_df['Team Code'])
+        )
         selected_idx = st.selectbox(
             "이동할 공정 선택",
             options=list(range(len(option_labels))),
@@ -452,21 +1138,20 @@ def page_admin():
         with col3:
             if st.button("⤒ 맨 위로", use_container_width=True):
                 if selected_idx > 0:
-                    row = processes_df.iloc[[selected_idx]]
-                    processes_df = pd.concat(
-                        [row, processes_df.drop(index=selected_idx)],
-                        ignore_index=True
-                    )
+                    # drop+concat 대신 행 인덱스 순열 한 번으로 재배치
+                    new_order = [selected_idx] + [
+                        i for i in range(len(processes_df)) if i != selected_idx
+                    ]
+                    processes_df = processes_df.iloc[new_order].reset_index(drop=True)
                     selected_idx = 0
                     moved = True
         with col4:
             if st.button("⤓ 맨 아래로", use_container_width=True):
                 if selected_idx < len(processes_df) - 1:
-                    row = processes_df.iloc[[selected_idx]]
-                    processes_df = pd.concat(
-                        [processes_df.drop(index=selected_idx), row],
-                        ignore_index=True
-                    )
+                    new_order = [
+                        i for i in range(len(processes_df)) if i != selected_idx
+                    ] + [selected_idx]
+                    processes_df = processes_df.iloc[new_order].reset_index(drop=True)
                     selected_idx = len(processes_df) - 1
                     moved = True
 
@@ -475,81 +1160,67 @@ def page_admin():
             st.session_state.processes_df = processes_df
             st.session_state.process_reorder_select_target = selected_idx
             st.success("✅ 공정 순서가 변경되었습니다!")
-            st.rerun()
+            # 공정 UI는 모두 이 프래그먼트 안에 있으므로 전체 스크립트 재실행 불필요
+            st.rerun(scope="fragment")
     
-    # 공정 데이터프레임 편집 (유형 한글 표시)
-    processes_display_df = st.session_state.processes_df.copy()
-    processes_display_df["Type"] = processes_display_df["Type"].map(
-        lambda v: PROCESS_TYPE_LABELS.get(v, v)
+    # 공정 데이터프레임 편집 (유형 한글 표시, assign은 기존 컬럼을 복사하지 않음)
+    processes_display_df = st.session_state.processes_df.assign(
+        Type=st.session_state.processes_df["Type"].map(
+            lambda v: PROCESS_TYPE_LABELS.get(v, v)
+        )
     )
 
     edited_processes_df = st.data_editor(
         processes_display_df,
         num_rows="dynamic",
-        column_config={
-            "Process Name": st.column_config.TextColumn(
-                "공정명",
-                required=True,
-                help="공정 이름을 입력하세요"
-            ),
-            "Type": st.column_config.SelectboxColumn(
-                "유형",
-                options=list(PROCESS_TYPE_VALUES.keys()),
-                required=True,
-                help="Duration: 기간 공정, Milestone: 특정일 공정"
-            ),
-            "Order": st.column_config.NumberColumn(
-                "순서",
-                min_value=1,
-                step=1,
-                required=True,
-                help="공정 순서 (낮을수록 먼저 실행)"
-            ),
-            "Team Code": st.column_config.TextColumn(
-                "팀코드",
-                required=True,
-                help="팀 설정과 연동할 코드 (영문 소문자 권장)"
-            )
-        },
+        column_config=_PROCESSES_COLUMN_CONFIG,
         hide_index=True,
         key="processes_editor"
     )
 
-    # 한글 유형을 내부 값으로 변환
+    # 한글 유형을 내부 값으로 변환 (dict 직접 매핑 + 미지의 값은 원본 유지)
     edited_processes_df["Type"] = edited_processes_df["Type"].map(
-        lambda v: PROCESS_TYPE_VALUES.get(v, v)
-    )
+        PROCESS_TYPE_VALUES
+    ).fillna(edited_processes_df["Type"])
     
-    # 공정 리스트 업데이트
-    if not edited_processes_df.equals(st.session_state.processes_df):
-        st.session_state.processes_df = edited_processes_df.copy()
-        # Order 재정렬
-        st.session_state.processes_df = st.session_state.processes_df.sort_values('Order').reset_index(drop=True)
+    # 공정 리스트 업데이트 (에디터에 편집 델타가 있을 때만 전체 비교 수행)
+    editor_state = st.session_state.get("processes_editor", {})
+    has_editor_delta = any(
+        editor_state.get(key)
+        for key in ("edited_rows", "added_rows", "deleted_rows")
+    )
+    if has_editor_delta and not edited_processes_df.equals(st.session_state.processes_df):
+        # 에디터가 이미 새 프레임을 돌려주므로 별도 copy 없이 정렬만 수행
+        st.session_state.processes_df = edited_processes_df.sort_values(
+            'Order', ignore_index=True
+        )
         st.session_state.processes_df['Order'] = range(1, len(st.session_state.processes_df) + 1)
         
-        # 팀 설정 동적 업데이트
-        for _, proc_row in st.session_state.processes_df.iterrows():
-            team_code = proc_row['Team Code']
-            if team_code not in st.session_state.team_settings:
-                st.session_state.team_settings[team_code] = {
-                    'work_weekdays': [0, 1, 2, 3, 4, 5],
-                    'team_holidays': set()
-                }
-        
-        # 사용하지 않는 팀 설정 제거
+        # 팀 설정 동적 업데이트 (행 순회 대신 키 집합 차이로 추가/제거)
         active_team_codes = set(st.session_state.processes_df['Team Code'].tolist())
-        st.session_state.team_settings = {
-            k: v for k, v in st.session_state.team_settings.items() 
-            if k in active_team_codes
-        }
+        for team_code in active_team_codes - st.session_state.team_settings.keys():
+            st.session_state.team_settings[team_code] = {
+                'work_weekdays': [0, 1, 2, 3, 4, 5],
+                'team_holidays': set()
+            }
+
+        # 사용하지 않는 팀 설정 제거
+        removed_team_codes = st.session_state.team_settings.keys() - active_team_codes
+        for team_code in removed_team_codes:
+            del st.session_state.team_settings[team_code]
+        if removed_team_codes:
+            refresh_holidays_total()
         st.success("✅ 공정 리스트가 업데이트되었습니다!")
-        st.rerun()
+        # 공정 UI는 모두 이 프래그먼트 안에 있으므로 전체 스크립트 재실행 불필요
+        st.rerun(scope="fragment")
     
     # 현재 공정 리스트 표시
     st.markdown("#### 📋 현재 공정 리스트")
-    processes_list_df = st.session_state.processes_df.sort_values('Order').copy()
-    processes_list_df["Type"] = processes_list_df["Type"].map(
-        lambda v: PROCESS_TYPE_LABELS.get(v, v)
+    # 저장 시점에 이미 Order 순으로 정렬되어 있어 그대로 사용 (세션 원본은 assign으로 보호)
+    processes_list_df = st.session_state.processes_df.assign(
+        Type=st.session_state.processes_df["Type"].map(
+            lambda v: PROCESS_TYPE_LABELS.get(v, v)
+        )
     )
     processes_list_df = processes_list_df.rename(columns={
         "Process Name": "공정명",
@@ -563,6 +1234,200 @@ def page_admin():
         hide_index=True
     )
 
+def page_admin():
+    """공정 설정(Admin) 페이지"""
+    st.markdown("### ⚙️ 공정 설정 (Admin)")
+    st.caption("시스템에서 사용할 공정을 정의하고 관리합니다.")
+
+    st.info("💡 공정을 추가/수정/삭제하면 다른 페이지에 즉시 반영됩니다.")
+
+    processes_admin_fragment()
+
+@st.fragment
+def leadtime_editor_fragment(selected_project):
+    """선택한 프로젝트의 소요기간 에디터 (셀 편집 시 이 블록만 재실행)"""
+    # 선택한 프로젝트의 블록 리스트 가져오기 (읽기 경로에서는 복사하지 않음)
+    project_df = st.session_state.projects_db[selected_project]
+
+    # Duration 타입 공정만 필터링 (원본이 Order 순이므로 필터만으로 순서 유지)
+    processes_df = st.session_state.processes_df
+    duration_processes = processes_df[processes_df['Type'] == 'Duration']
+
+    duration_names = duration_processes['Process Name'].tolist()
+
+    # Duration 공정의 Days 컬럼 추가 (없으면 기본값 5)
+    # 보완이 필요할 때만 복사해 저장 전의 세션 원본은 건드리지 않음
+    missing_days_cols = [
+        f"{name}_Days" for name in duration_names
+        if f"{name}_Days" not in project_df.columns
+    ]
+    if missing_days_cols:
+        project_df = project_df.copy()
+        project_df[missing_days_cols] = np.int16(5)
+
+    st.write(f"**프로젝트: {selected_project}** ({len(project_df)}개 블록)")
+
+    # 일괄 적용 기능
+    with st.expander("🔧 일괄 적용", expanded=False):
+        st.write("모든 블록에 동일한 소요일수를 일괄 적용합니다.")
+        col1, col2 = st.columns(2)
+
+        with col1:
+            selected_process = st.selectbox(
+                "공정 선택",
+                options=duration_names,
+                key="batch_process"
+            )
+
+        with col2:
+            batch_days = st.number_input(
+                "소요 일수",
+                min_value=1,
+                max_value=100,
+                value=5,
+                step=1,
+                key="batch_days"
+            )
+
+        if st.button("✅ 일괄 적용", type="primary"):
+            days_col = f"{selected_process}_Days"
+            project_df[days_col] = batch_days
+            st.session_state.projects_db[selected_project] = project_df
+            st.session_state.projects_db_version += 1
+            st.success(f"✅ 모든 블록의 '{selected_process}' 공정을 {batch_days}일로 설정했습니다!")
+            st.rerun()
+
+    # 데이터 에디터
+    st.write("**블록별/공정별 소요일수 입력**")
+
+    # 컬럼 구성: 기본 컬럼 + Duration 공정 Days 컬럼
+    display_columns = ['Project_No', 'Block_No', 'Weight', 'Delivery_Date']
+    display_columns += [f"{name}_Days" for name in duration_names]
+
+    # 컬럼 설정 딕셔너리 (공정 구성이 같으면 캐시 재사용)
+    column_config_dict = get_leadtime_column_config(tuple(duration_names))
+
+    # 블록이 많으면 표시 구간을 제한 (에디터로 보내는 데이터 양을 일정하게 유지)
+    editor_window_size = 200
+    if len(project_df) > editor_window_size:
+        window_start, window_end = st.slider(
+            "표시할 블록 범위",
+            min_value=0,
+            max_value=len(project_df),
+            value=(0, editor_window_size),
+            key=f"leadtime_window_{selected_project}"
+        )
+    else:
+        window_start, window_end = 0, len(project_df)
+
+    edited_df = st.data_editor(
+        project_df[display_columns].iloc[window_start:window_end],
+        num_rows="fixed",
+        column_config=column_config_dict,
+        use_container_width=True,
+        hide_index=True,
+        key=f"leadtime_editor_{selected_project}_{window_start}_{window_end}"
+    )
+
+    # 저장 버튼
+    if st.button("💾 소요기간 저장", type="primary", use_container_width=True):
+        # 표시 구간의 Days 컬럼만 원본 데이터프레임에 반영 (인덱스 기준)
+        days_cols = [col for col in edited_df.columns if col.endswith('_Days')]
+        project_df.loc[edited_df.index, days_cols] = edited_df[days_cols]
+
+        st.session_state.projects_db[selected_project] = project_df
+        st.session_state.projects_db_version += 1
+        st.success("✅ 소요기간이 저장되었습니다!")
+
+@st.fragment
+def project_list_fragment():
+    """등록된 프로젝트 목록 (다른 위젯 상호작용 시 목록 재직렬화를 건너뜀)"""
+    st.markdown("#### 📊 등록된 프로젝트 목록")
+
+    if len(st.session_state.projects_db) == 0:
+        st.info("등록된 프로젝트가 없습니다.")
+        return
+
+    for project_no, project_df in st.session_state.projects_db.items():
+        with st.expander(f"📁 {project_no} ({len(project_df)}개 블록)", expanded=False):
+            # 날짜만 표시 (버전이 같은 rerun에서는 캐시된 표시 프레임 재사용)
+            display_df = build_project_display_df(
+                st.session_state.projects_db_version, project_no, project_df
+            )
+            st.dataframe(display_df, use_container_width=True, hide_index=True)
+
+            col1, col2 = st.columns(2)
+            with col1:
+                if st.button(f"🗑️ 삭제", key=f"delete_{project_no}"):
+                    del st.session_state.projects_db[project_no]
+                    st.session_state.projects_db_version += 1
+                    st.success(f"✅ '{project_no}' 프로젝트가 삭제되었습니다!")
+                    st.rerun()
+
+@st.fragment
+def capa_editor_fragment(selected_project_capa):
+    """선택한 프로젝트의 CAPA 에디터 (셀 편집 시 이 블록만 재실행)"""
+    # 공정 리스트 가져오기 (저장 시점에 이미 Order 순으로 정렬됨)
+    processes_df = st.session_state.processes_df
+
+    # CAPA 데이터프레임 생성 (행 순회 대신 공정명 리스트로 한 번에 구성)
+    process_names = processes_df['Process Name'].tolist()
+    capa_df = pd.DataFrame({
+        'Process Name': process_names,
+        'Monthly CAPA (Ton)': [
+            # 기존 값이 있으면 가져오기, 없으면 0
+            st.session_state.project_capa.get((selected_project_capa, name), 0)
+            for name in process_names
+        ]
+    })
+
+    # 전체 공정 동일값 적용 기능
+    with st.expander("🔧 전체 공정 동일값 적용", expanded=False):
+        col1, col2 = st.columns([2, 1])
+        with col1:
+            uniform_capa = st.number_input(
+                "월간 CAPA (Ton)",
+                min_value=0.0,
+                value=0.0,
+                step=10.0,
+                key="uniform_capa_input"
+            )
+        with col2:
+            st.write("")  # 공간 확보
+            st.write("")  # 공간 확보
+            if st.button("✅ 전체 적용", key="apply_uniform_capa"):
+                # 선택한 프로젝트의 모든 공정 CAPA를 즉시 저장
+                for process_name in process_names:
+                    capa_key = (selected_project_capa, process_name)
+                    st.session_state.project_capa[capa_key] = float(uniform_capa)
+                st.success(f"✅ 모든 공정의 CAPA를 {uniform_capa} Ton으로 설정했습니다!")
+                # CAPA 값은 이 프래그먼트의 에디터에만 표시되므로 블록만 갱신
+                st.rerun(scope="fragment")
+
+    # 데이터 에디터 (컬럼 설정은 모듈 수준 고정 객체 재사용)
+    edited_capa_df = st.data_editor(
+        capa_df,
+        num_rows="fixed",
+        column_config=_CAPA_COLUMN_CONFIG,
+        use_container_width=True,
+        hide_index=True,
+        key=f"capa_editor_{selected_project_capa}"
+    )
+
+    # 저장 버튼
+    if st.button("💾 CAPA 정보 저장", type="primary", use_container_width=True):
+        # NaN 처리와 형 변환은 배열 한 번으로 끝내고, 바뀐 키만 session_state에 기록
+        new_values = edited_capa_df['Monthly CAPA (Ton)'].fillna(0.0).astype(float)
+        for process_name, monthly_capa in zip(edited_capa_df['Process Name'], new_values):
+            capa_key = (selected_project_capa, process_name)
+            if st.session_state.project_capa.get(capa_key) != monthly_capa:
+                st.session_state.project_capa[capa_key] = monthly_capa
+
+        st.success(f"✅ '{selected_project_capa}' 프로젝트의 CAPA 정보가 저장되었습니다!")
+
+        # 저장된 CAPA 정보 요약 표시
+        st.info(f"📋 저장된 CAPA 정보: {len([k for k in st.session_state.project_capa.keys() if k[0] == selected_project_capa])}개 공정")
+
 def page_input():
     """기초정보 관리 페이지 - 프로젝트 마스터 등록 및 공정 시수 입력"""
     st.markdown("### 📥 기초정보 관리")
@@ -613,56 +1478,24 @@ def page_input():
         st.markdown("#### 📂 양식 다운로드")
         st.caption("아래 버튼을 눌러 최신 공정이 반영된 입력 양식을 받으세요.")
 
-        # 최신 공정 설정 데이터프레임 가져오기 (버튼 클릭 시마다 최신 값 반영)
-        processes_df = st.session_state.processes_df.copy()
-
-        # Order 순서대로 정렬
-        processes_df = processes_df.sort_values('Order').reset_index(drop=True)
+        # 최신 공정 설정 데이터프레임 가져오기 (저장 시점에 이미 Order 순으로 정렬됨)
+        processes_df = st.session_state.processes_df
 
         # 고정 컬럼
         fixed_columns = ['Project_No', 'Block_No', 'Weight', 'Delivery_Date', 'Fixed_Start_Date']
 
-        # 동적 컬럼 생성 (Order 순서대로)
-        dynamic_columns = []
-        for _, proc_row in processes_df.iterrows():
-            process_name = proc_row['Process Name']
-            process_type = proc_row['Type']
-
-            if process_type == 'Duration':
-                dynamic_columns.append(f"{process_name}_Days")
-            elif process_type == 'Milestone':
-                dynamic_columns.append(f"{process_name}_Date")
+        # 동적 컬럼 생성 (Order 순서대로, 행 순회 없이)
+        dynamic_columns = build_dynamic_columns(processes_df)
 
         # 전체 컬럼 리스트 (고정 컬럼 + 동적 컬럼)
         template_columns = fixed_columns + dynamic_columns
 
-        # 빈 데이터프레임 생성
-        template_df = pd.DataFrame(columns=template_columns)
-
-        # 엑셀 파일 생성 (메모리)
-        excel_buffer = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            template_df.to_excel(writer, index=False, sheet_name='Input_Data')
-        excel_buffer.seek(0)
-
-        # Fixed_Start_Date 헤더에 설명 추가
-        workbook = load_workbook(excel_buffer)
-        sheet = workbook["Input_Data"]
-        header_cells = {cell.value: cell for cell in sheet[1] if cell.value}
-        fixed_cell = header_cells.get("Fixed_Start_Date")
-        if fixed_cell is not None:
-            fixed_cell.comment = Comment(
-                "입력 시 해당일부터 첫 공정 시작 (비워두면 납기일 기준 역산)",
-                "System"
-            )
-        excel_buffer = io.BytesIO()
-        workbook.save(excel_buffer)
-        excel_buffer.seek(0)
-
-        # 다운로드 버튼
+        # 다운로드 버튼 (callable을 넘기면 클릭 시점에만 엑셀을 생성하고,
+        # 생성된 바이트는 공정 구성이 같은 동안 캐시에 남는다)
+        template_key = tuple(template_columns)
         st.download_button(
             label="📥 표준 입력 양식 다운로드 (.xlsx)",
-            data=excel_buffer.getvalue(),
+            data=lambda: build_template_bytes(template_key),
             file_name="Input_Template.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
@@ -691,9 +1524,19 @@ def page_input():
             if uploaded_file is not None:
                 try:
                     if uploaded_file.name.endswith('.csv'):
-                        df = pd.read_csv(uploaded_file, encoding='utf-8-sig')
+                        try:
+                            # pyarrow CSV 파서는 멀티스레드라 대용량 업로드에서 더 빠름
+                            csv_table = pacsv.read_csv(
+                                uploaded_file,
+                                read_options=pacsv.ReadOptions(encoding='utf-8-sig')
+                            )
+                            df = csv_table.to_pandas()
+                        except pa.ArrowInvalid:
+                            uploaded_file.seek(0)
+                            df = pd.read_csv(uploaded_file, encoding='utf-8-sig')
                     else:
-                        df = pd.read_excel(uploaded_file)
+                        excel_engine = 'calamine' if _HAS_CALAMINE else None
+                        df = pd.read_excel(uploaded_file, engine=excel_engine)
                     
                     st.success(f"✅ 파일이 성공적으로 읽혔습니다! ({len(df)}행)")
                     
@@ -706,53 +1549,65 @@ def page_input():
                         st.info("필수 컬럼: Project_No (호선번호), Block_No (블록번호), Weight (중량), Delivery_Date (납기일)")
                     else:
                         # 동적 컬럼 유효성 검사 (선택적)
-                        processes_df = st.session_state.processes_df
-                        expected_dynamic_cols = []
-                        for _, proc_row in processes_df.iterrows():
-                            process_name = proc_row['Process Name']
-                            process_type = proc_row['Type']
-                            
-                            if process_type == 'Duration':
-                                expected_dynamic_cols.append(f"{process_name}_Days")
-                            elif process_type == 'Milestone':
-                                expected_dynamic_cols.append(f"{process_name}_Date")
-                        
+                        expected_dynamic_cols = build_dynamic_columns(
+                            st.session_state.processes_df
+                        )
+
                         missing_dynamic_cols = [col for col in expected_dynamic_cols if col not in df.columns]
                         if missing_dynamic_cols:
                             st.warning(f"⚠️ 일부 공정 컬럼이 없습니다: {', '.join(missing_dynamic_cols)}")
                             st.info("💡 이 컬럼들은 나중에 추가할 수 있습니다. 필수 컬럼만 있어도 등록 가능합니다.")
                         
-                    # Delivery_Date를 datetime으로 변환
-                    df['Delivery_Date'] = pd.to_datetime(df['Delivery_Date'])
+                    # Delivery_Date를 datetime으로 변환 (일 단위 데이터라 초 해상도로 통일)
+                    df['Delivery_Date'] = pd.to_datetime(df['Delivery_Date']).astype('datetime64[s]')
 
-                    # Fixed_Start_Date 처리 (없으면 None)
+                    # Fixed_Start_Date 처리 (없으면 NaT)
                     if 'Fixed_Start_Date' in df.columns:
-                        df['Fixed_Start_Date'] = pd.to_datetime(df['Fixed_Start_Date'], errors='coerce')
-                        df.loc[df['Fixed_Start_Date'].isna(), 'Fixed_Start_Date'] = None
+                        df['Fixed_Start_Date'] = pd.to_datetime(
+                            df['Fixed_Start_Date'], errors='coerce'
+                        ).astype('datetime64[s]')
                     else:
-                        df['Fixed_Start_Date'] = None
-                        
-                    # 데이터 미리보기 (날짜만 표시)
-                    display_df = df.copy()
-                    display_df['Delivery_Date'] = pd.to_datetime(display_df['Delivery_Date']).dt.date
-                    if 'Fixed_Start_Date' in display_df.columns:
-                        display_df['Fixed_Start_Date'] = pd.to_datetime(
-                            display_df['Fixed_Start_Date'], errors='coerce'
-                        ).dt.date
+                        df['Fixed_Start_Date'] = pd.Series(
+                            pd.NaT, index=df.index, dtype='datetime64[s]'
+                        )
+
+                    # 저장 프레임도 통합 경로와 같은 저폭 타입으로 유지
+                    # (업로드가 대용량 경로라 등록 시점에 바로 다운캐스트)
+                    df['Weight'] = df['Weight'].astype('float32')
+                    upload_days_cols = [
+                        col for col in df.columns if col.endswith('_Days')
+                    ]
+                    if upload_days_cols:
+                        # 결측을 허용해야 하므로 nullable Int16 (통합 시 5로 보충)
+                        df[upload_days_cols] = (
+                            df[upload_days_cols].astype('float64').round().astype('Int16')
+                        )
+
+                    # 데이터 미리보기 (날짜만 표시, 위에서 이미 datetime으로 정규화됨)
+                    display_df = df.assign(
+                        Delivery_Date=df['Delivery_Date'].dt.date,
+                        Fixed_Start_Date=df['Fixed_Start_Date'].dt.date
+                    )
                     st.dataframe(display_df, use_container_width=True, hide_index=True)
                     
                     # 프로젝트별로 그룹화하여 저장
                     if st.button("📥 프로젝트 등록", type="primary", use_container_width=True):
-                        for project_no in df['Project_No'].unique():
-                            project_df = df[df['Project_No'] == project_no].copy()
-                            
-                            # 기존 프로젝트 확인
-                            if project_no in st.session_state.projects_db:
-                                st.warning(f"⚠️ '{project_no}' 프로젝트가 이미 존재합니다. 덮어쓰기를 진행합니다.")
-                            
+                        # 기존 프로젝트 확인 (프로젝트별 재검사 대신 집합 교집합 한 번)
+                        overlapping = st.session_state.projects_db.keys() & set(df['Project_No'])
+                        for project_no in overlapping:
+                            st.warning(f"⚠️ '{project_no}' 프로젝트가 이미 존재합니다. 덮어쓰기를 진행합니다.")
+
+                        # groupby 한 번으로 분할 (프로젝트 수만큼 불리언 마스크를 만들지 않음)
+                        registered = 0
+                        for project_no, project_df in df.groupby('Project_No', sort=False):
+                            project_df = project_df.reset_index(drop=True)
+                            # 프로젝트 내에서 반복되는 호선번호는 범주형으로 저장
+                            project_df['Project_No'] = project_df['Project_No'].astype('category')
                             st.session_state.projects_db[project_no] = project_df
-                        
-                        st.success(f"✅ {len(df['Project_No'].unique())}개의 프로젝트가 등록되었습니다!")
+                            registered += 1
+
+                        st.session_state.projects_db_version += 1
+                        st.success(f"✅ {registered}개의 프로젝트가 등록되었습니다!")
                         st.rerun()
                             
                 except Exception as e:
@@ -777,44 +1632,34 @@ def page_input():
                         'Project_No': [project_no],
                         'Block_No': [block_no],
                         'Weight': [weight],
-                        'Delivery_Date': [pd.to_datetime(delivery_date)]
+                        'Delivery_Date': pd.to_datetime([delivery_date]).astype('datetime64[s]')
                     })
                     
                     if project_no in st.session_state.projects_db:
-                        # 기존 프로젝트에 블록 추가
                         existing_df = st.session_state.projects_db[project_no]
-                        if block_no in existing_df['Block_No'].values:
+                        block_mask = existing_df['Block_No'] == block_no
+                        if block_mask.any():
+                            # 기존 블록은 제자리 갱신 (전체 프레임 재생성 없이, 입력된 소요기간 유지)
                             st.warning(f"⚠️ '{block_no}' 블록이 이미 존재합니다. 업데이트합니다.")
-                            existing_df = existing_df[existing_df['Block_No'] != block_no]
-                        st.session_state.projects_db[project_no] = pd.concat([existing_df, new_row], ignore_index=True)
+                            existing_df.loc[block_mask, ['Weight', 'Delivery_Date']] = [
+                                weight, pd.Timestamp(delivery_date)
+                            ]
+                        else:
+                            # 신규 블록은 행 단위 확장 (concat으로 전체 복사하지 않음)
+                            existing_df.loc[len(existing_df)] = new_row.iloc[0]
+                        st.session_state.projects_db[project_no] = existing_df
                     else:
-                        # 신규 프로젝트 생성
+                        # 신규 프로젝트 생성 (호선번호는 업로드 경로와 동일하게 범주형)
+                        new_row['Project_No'] = new_row['Project_No'].astype('category')
                         st.session_state.projects_db[project_no] = new_row
-                    
+
+                    st.session_state.projects_db_version += 1
                     st.success(f"✅ '{project_no}' 프로젝트에 '{block_no}' 블록이 추가되었습니다!")
                     st.rerun()
         
-        # 등록된 프로젝트 목록 표시
+        # 등록된 프로젝트 목록 표시 (다른 위젯 조작 시 목록 전체 재렌더링 방지)
         st.divider()
-        st.markdown("#### 📊 등록된 프로젝트 목록")
-        
-        if len(st.session_state.projects_db) == 0:
-            st.info("등록된 프로젝트가 없습니다.")
-        else:
-            for project_no, project_df in st.session_state.projects_db.items():
-                with st.expander(f"📁 {project_no} ({len(project_df)}개 블록)", expanded=False):
-                    # 날짜만 표시 (시간 제거)
-                    display_df = project_df.copy()
-                    if 'Delivery_Date' in display_df.columns:
-                        display_df['Delivery_Date'] = pd.to_datetime(display_df['Delivery_Date']).dt.date
-                    st.dataframe(display_df, use_container_width=True, hide_index=True)
-                    
-                    col1, col2 = st.columns(2)
-                    with col1:
-                        if st.button(f"🗑️ 삭제", key=f"delete_{project_no}"):
-                            del st.session_state.projects_db[project_no]
-                            st.success(f"✅ '{project_no}' 프로젝트가 삭제되었습니다!")
-                            st.rerun()
+        project_list_fragment()
     
     # ========================================================================
     # 2단계: 공정별 소요기간 입력
@@ -835,95 +1680,8 @@ def page_input():
             )
             
             if selected_project:
-                # 선택한 프로젝트의 블록 리스트 가져오기
-                project_df = st.session_state.projects_db[selected_project].copy()
-                
-                # Duration 타입 공정만 필터링
-                processes_df = st.session_state.processes_df
-                duration_processes = processes_df[processes_df['Type'] == 'Duration'].sort_values('Order')
-                
-                # Duration 공정의 Days 컬럼 추가 (없으면 기본값 5)
-                for _, proc_row in duration_processes.iterrows():
-                    process_name = proc_row['Process Name']
-                    days_col = f"{process_name}_Days"
-                    if days_col not in project_df.columns:
-                        project_df[days_col] = 5
-                
-                st.write(f"**프로젝트: {selected_project}** ({len(project_df)}개 블록)")
-                
-                # 일괄 적용 기능
-                with st.expander("🔧 일괄 적용", expanded=False):
-                    st.write("모든 블록에 동일한 소요일수를 일괄 적용합니다.")
-                    col1, col2 = st.columns(2)
-                    
-                    with col1:
-                        selected_process = st.selectbox(
-                            "공정 선택",
-                            options=duration_processes['Process Name'].tolist(),
-                            key="batch_process"
-                        )
-                    
-                    with col2:
-                        batch_days = st.number_input(
-                            "소요 일수",
-                            min_value=1,
-                            max_value=100,
-                            value=5,
-                            step=1,
-                            key="batch_days"
-                        )
-                    
-                    if st.button("✅ 일괄 적용", type="primary"):
-                        days_col = f"{selected_process}_Days"
-                        project_df[days_col] = batch_days
-                        st.session_state.projects_db[selected_project] = project_df
-                        st.success(f"✅ 모든 블록의 '{selected_process}' 공정을 {batch_days}일로 설정했습니다!")
-                        st.rerun()
-                
-                # 데이터 에디터
-                st.write("**블록별/공정별 소요일수 입력**")
-                
-                # 컬럼 구성: 기본 컬럼 + Duration 공정 Days 컬럼
-                display_columns = ['Project_No', 'Block_No', 'Weight', 'Delivery_Date']
-                for _, proc_row in duration_processes.iterrows():
-                    process_name = proc_row['Process Name']
-                    display_columns.append(f"{process_name}_Days")
-                
-                # 컬럼 설정 딕셔너리 생성
-                column_config_dict = {
-                    "Project_No": st.column_config.TextColumn("호선번호", disabled=True),
-                    "Block_No": st.column_config.TextColumn("블록번호", disabled=True),
-                    "Weight": st.column_config.NumberColumn("중량(Ton)", disabled=True),
-                    "Delivery_Date": st.column_config.DateColumn("납기일", disabled=True),
-                }
-                for _, proc_row in duration_processes.iterrows():
-                    process_name = proc_row['Process Name']
-                    days_col = f"{process_name}_Days"
-                    column_config_dict[days_col] = st.column_config.NumberColumn(
-                        f"{process_name} (일)",
-                        min_value=1,
-                        max_value=100,
-                        step=1
-                    )
-                
-                edited_df = st.data_editor(
-                    project_df[display_columns],
-                    num_rows="fixed",
-                    column_config=column_config_dict,
-                    use_container_width=True,
-                    hide_index=True,
-                    key=f"leadtime_editor_{selected_project}"
-                )
-                
-                # 저장 버튼
-                if st.button("💾 소요기간 저장", type="primary", use_container_width=True):
-                    # 원본 데이터프레임에 Days 컬럼 업데이트
-                    for col in edited_df.columns:
-                        if col.endswith('_Days'):
-                            project_df[col] = edited_df[col]
-                    
-                    st.session_state.projects_db[selected_project] = project_df
-                    st.success("✅ 소요기간이 저장되었습니다!")
+                # 셀 편집 시 페이지 전체 대신 에디터 블록만 재실행
+                leadtime_editor_fragment(selected_project)
     
     # ========================================================================
     # 프로젝트별 월 CAPA(생산능력) 설정
@@ -944,88 +1702,8 @@ def page_input():
         )
         
         if selected_project_capa:
-            # 공정 리스트 가져오기 (Order 순서대로)
-            processes_df = st.session_state.processes_df.sort_values('Order').reset_index(drop=True)
-            
-            # CAPA 데이터프레임 생성
-            capa_data = []
-            for _, proc_row in processes_df.iterrows():
-                process_name = proc_row['Process Name']
-                # 기존 값이 있으면 가져오기, 없으면 0
-                capa_key = (selected_project_capa, process_name)
-                existing_capa = st.session_state.project_capa.get(capa_key, 0)
-                
-                capa_data.append({
-                    'Process Name': process_name,
-                    'Monthly CAPA (Ton)': existing_capa
-                })
-            
-            capa_df = pd.DataFrame(capa_data)
-            
-            # 전체 공정 동일값 적용 기능
-            with st.expander("🔧 전체 공정 동일값 적용", expanded=False):
-                col1, col2 = st.columns([2, 1])
-                with col1:
-                    uniform_capa = st.number_input(
-                        "월간 CAPA (Ton)",
-                        min_value=0.0,
-                        value=0.0,
-                        step=10.0,
-                        key="uniform_capa_input"
-                    )
-                with col2:
-                    st.write("")  # 공간 확보
-                    st.write("")  # 공간 확보
-                    if st.button("✅ 전체 적용", key="apply_uniform_capa"):
-                        # 선택한 프로젝트의 모든 공정 CAPA를 즉시 저장
-                        for _, proc_row in processes_df.iterrows():
-                            process_name = proc_row['Process Name']
-                            capa_key = (selected_project_capa, process_name)
-                            st.session_state.project_capa[capa_key] = float(uniform_capa)
-                        st.success(f"✅ 모든 공정의 CAPA를 {uniform_capa} Ton으로 설정했습니다!")
-                        st.rerun()
-            
-            # 데이터 에디터 설정
-            column_config_dict = {
-                "Process Name": st.column_config.TextColumn("공정명", disabled=True),
-                "Monthly CAPA (Ton)": st.column_config.NumberColumn(
-                    "월간 목표 생산량 (Ton)",
-                    min_value=0.0,
-                    step=10.0,
-                    format="%.1f"
-                )
-            }
-            
-            # 데이터 에디터
-            edited_capa_df = st.data_editor(
-                capa_df,
-                num_rows="fixed",
-                column_config=column_config_dict,
-                use_container_width=True,
-                hide_index=True,
-                key=f"capa_editor_{selected_project_capa}"
-            )
-            
-            # 저장 버튼
-            if st.button("💾 CAPA 정보 저장", type="primary", use_container_width=True):
-                # session_state에 저장
-                for _, row in edited_capa_df.iterrows():
-                    process_name = row['Process Name']
-                    monthly_capa = row['Monthly CAPA (Ton)']
-                    
-                    # NaN 체크 및 기본값 처리
-                    if pd.isna(monthly_capa):
-                        monthly_capa = 0.0
-                    else:
-                        monthly_capa = float(monthly_capa)
-                    
-                    capa_key = (selected_project_capa, process_name)
-                    st.session_state.project_capa[capa_key] = monthly_capa
-                
-                st.success(f"✅ '{selected_project_capa}' 프로젝트의 CAPA 정보가 저장되었습니다!")
-                
-                # 저장된 CAPA 정보 요약 표시
-                st.info(f"📋 저장된 CAPA 정보: {len([k for k in st.session_state.project_capa.keys() if k[0] == selected_project_capa])}개 공정")
+            # 셀 편집 시 페이지 전체 대신 에디터 블록만 재실행
+            capa_editor_fragment(selected_project_capa)
     
     # ========================================================================
     # 3단계: 실시간 작업 수정 모드
@@ -1037,27 +1715,28 @@ def page_input():
         if len(st.session_state.projects_db) == 0:
             st.warning("⚠️ 먼저 [1단계]에서 프로젝트를 등록해주세요.")
         else:
-            # 모든 프로젝트 데이터 통합
-            all_projects_data = []
-            for project_no, project_df in st.session_state.projects_db.items():
-                all_projects_data.append(project_df.copy())
-            
-            if not all_projects_data:
+            # 모든 프로젝트 데이터 통합 (DB 버전이 같으면 캐시된 결합 결과 재사용)
+            combined_df = combine_projects_db(
+                st.session_state.projects_db_version,
+                st.session_state.projects_db
+            )
+
+            if len(combined_df) == 0:
                 st.warning("⚠️ 등록된 데이터가 없습니다.")
             else:
-                combined_df = pd.concat(all_projects_data, ignore_index=True)
 
                 if 'Fixed_Start_Date' not in combined_df.columns:
                     combined_df['Fixed_Start_Date'] = pd.NaT
                 
-                # Duration 공정의 Days 컬럼 추가 (없으면 기본값 5)
+                # Duration 공정의 Days 컬럼 추가 (없으면 기본값 5, 일괄 대입)
                 processes_df = st.session_state.processes_df
-                duration_processes = processes_df[processes_df['Type'] == 'Duration'].sort_values('Order')
-                for _, proc_row in duration_processes.iterrows():
-                    process_name = proc_row['Process Name']
-                    days_col = f"{process_name}_Days"
-                    if days_col not in combined_df.columns:
-                        combined_df[days_col] = 5
+                duration_processes = processes_df[processes_df['Type'] == 'Duration']
+                missing_days_cols = [
+                    f"{name}_Days" for name in duration_processes['Process Name']
+                    if f"{name}_Days" not in combined_df.columns
+                ]
+                if missing_days_cols:
+                    combined_df[missing_days_cols] = np.int16(5)
                 
                 # ====================================================================
                 # 필터링 섹션
@@ -1091,8 +1770,8 @@ def page_input():
                         key="realtime_block_search"
                     )
                 
-                # 필터링 적용
-                filtered_df = combined_df.copy()
+                # 필터링 적용 (마스킹이 새 프레임을 만들므로 사전 복사는 불필요)
+                filtered_df = combined_df
                 
                 # 프로젝트 필터
                 if selected_project_filter != "전체":
@@ -1100,9 +1779,11 @@ def page_input():
                 
                 # 블록 검색 필터
                 if block_search:
-                    # Block_No를 문자열로 변환 후 검색
+                    # 사전 계산된 소문자 컬럼에 고정 문자열 검색 (정규식/재변환 없음)
                     filtered_df = filtered_df[
-                        filtered_df['Block_No'].astype(str).str.contains(block_search, case=False, na=False)
+                        filtered_df['_block_no_lower'].str.contains(
+                            block_search.lower(), regex=False, na=False
+                        )
                     ]
                 
                 # 공정 필터에 따라 표시할 컬럼 결정
@@ -1115,11 +1796,10 @@ def page_input():
                         display_columns.append(selected_days_col)
                 else:
                     # 모든 Duration 공정의 Days 컬럼 추가
-                    for _, proc_row in duration_processes.iterrows():
-                        process_name = proc_row['Process Name']
-                        days_col = f"{process_name}_Days"
-                        if days_col in filtered_df.columns:
-                            display_columns.append(days_col)
+                    display_columns += [
+                        f"{name}_Days" for name in duration_processes['Process Name']
+                        if f"{name}_Days" in filtered_df.columns
+                    ]
                 
                 # 존재하는 컬럼만 선택
                 display_columns = [col for col in display_columns if col in filtered_df.columns]
@@ -1131,35 +1811,32 @@ def page_input():
                     st.success(f"✅ {len(filtered_df)}개 블록이 표시됩니다.")
                     
                     # ====================================================================
-                    # 데이터 에디터 설정
+                    # 데이터 에디터 설정 (표시 컬럼이 같으면 캐시 재사용)
                     # ====================================================================
-                    column_config_dict = {
-                        "Project_No": st.column_config.TextColumn("호선번호", disabled=True),
-                        "Block_No": st.column_config.TextColumn("블록번호", disabled=True),
-                        "Weight": st.column_config.NumberColumn("중량(Ton)", disabled=True),
-                        "Delivery_Date": st.column_config.DateColumn("납기일", disabled=True),
-                    "Fixed_Start_Date": st.column_config.DateColumn("지정 착수일"),
-                    }
-                    
-                    # 편집 가능한 Days 컬럼 설정
-                    for col in display_columns:
-                        if col.endswith('_Days'):
-                            process_name = col.replace('_Days', '')
-                            column_config_dict[col] = st.column_config.NumberColumn(
-                                f"{process_name} (일)",
-                                min_value=1,
-                                max_value=100,
-                                step=1
-                            )
-                    
+                    column_config_dict = get_realtime_column_config(tuple(display_columns))
+
+                    # 블록이 많으면 표시 구간을 제한 (에디터로 보내는 데이터 양을 일정하게 유지)
+                    editor_window_size = 200
+                    if len(filtered_df) > editor_window_size:
+                        window_start, window_end = st.slider(
+                            "표시할 블록 범위",
+                            min_value=0,
+                            max_value=len(filtered_df),
+                            value=(0, editor_window_size),
+                            key="realtime_editor_window"
+                        )
+                    else:
+                        window_start, window_end = 0, len(filtered_df)
+                    window_df = filtered_df.iloc[window_start:window_end]
+
                     # 데이터 에디터
                     edited_df = st.data_editor(
-                        filtered_df,
+                        window_df,
                         num_rows="fixed",
                         column_config=column_config_dict,
                         use_container_width=True,
                         hide_index=True,
-                        key="realtime_editor"
+                        key=f"realtime_editor_{window_start}_{window_end}"
                     )
                     
                     # ====================================================================
@@ -1169,48 +1846,11 @@ def page_input():
                     
                     with col1:
                         if st.button("💾 변경사항 저장", type="primary", use_container_width=True):
-                            # 원본 데이터에 변경사항 반영
-                            changes_made = False
-                            
-                            # edited_df와 filtered_df를 비교하여 변경사항 확인
-                            for idx in edited_df.index:
-                                edited_row = edited_df.loc[idx]
-                                
-                                # 프로젝트와 블록으로 원본 데이터 찾기
-                                project_no = edited_row['Project_No']
-                                block_no = edited_row['Block_No']
-                                
-                                if project_no in st.session_state.projects_db:
-                                    project_df = st.session_state.projects_db[project_no]
-                                    
-                                    # 해당 블록 찾기
-                                    block_mask = project_df['Block_No'] == block_no
-                                    if block_mask.any():
-                                        # Days 컬럼 업데이트
-                                        for col in edited_df.columns:
-                                            if col == "Fixed_Start_Date":
-                                                new_value = edited_row[col]
-                                                if pd.notna(new_value):
-                                                    project_df.loc[block_mask, col] = pd.to_datetime(new_value)
-                                                    changes_made = True
-                                                elif col in project_df.columns:
-                                                    project_df.loc[block_mask, col] = pd.NaT
-                                                    changes_made = True
-                                            elif col.endswith('_Days'):
-                                                if col in project_df.columns:
-                                                    old_value = project_df.loc[block_mask, col].iloc[0]
-                                                    new_value = edited_row[col]
-                                                    if pd.notna(new_value) and pd.notna(old_value):
-                                                        if float(old_value) != float(new_value):
-                                                            project_df.loc[block_mask, col] = int(new_value)
-                                                            changes_made = True
-                                                    elif pd.notna(new_value) and pd.isna(old_value):
-                                                        project_df.loc[block_mask, col] = int(new_value)
-                                                        changes_made = True
-                                        
-                                        st.session_state.projects_db[project_no] = project_df
-                            
+                            # 변경 셀만 벡터 비교로 추려 원본 데이터에 반영
+                            changes_made = apply_realtime_edits(edited_df, window_df)
+
                             if changes_made:
+                                st.session_state.projects_db_version += 1
                                 st.success("✅ 변경사항이 저장되었습니다!")
                                 st.rerun()
                             else:
@@ -1218,67 +1858,16 @@ def page_input():
                     
                     with col2:
                         if st.button("🔄 스케줄 재계산", type="secondary", use_container_width=True):
-                            # 변경사항 먼저 저장
-                            for idx in edited_df.index:
-                                edited_row = edited_df.loc[idx]
-                                project_no = edited_row['Project_No']
-                                block_no = edited_row['Block_No']
-                                
-                                if project_no in st.session_state.projects_db:
-                                    project_df = st.session_state.projects_db[project_no]
-                                    block_mask = project_df['Block_No'] == block_no
-                                    
-                                    if block_mask.any():
-                                        for col in edited_df.columns:
-                                            if col == "Fixed_Start_Date":
-                                                if pd.notna(new_value):
-                                                    project_df.loc[block_mask, col] = pd.to_datetime(new_value)
-                                                else:
-                                                    project_df.loc[block_mask, col] = pd.NaT
-                                            elif col.endswith('_Days'):
-                                                if col in project_df.columns:
-                                                    new_value = edited_row[col]
-                                                    if pd.notna(new_value):
-                                                        project_df.loc[block_mask, col] = int(new_value)
-                                        
-                                        st.session_state.projects_db[project_no] = project_df
-                            
-                            # 데이터 통합 (스케줄링을 위해)
-                            all_data = []
-                            for proj_no, proj_df in st.session_state.projects_db.items():
-                                merged_df = proj_df.copy()
-                                merged_df['프로젝트명'] = merged_df['Project_No']
-                                merged_df['블록명'] = merged_df['Block_No']
-                                merged_df['중량(Ton)'] = merged_df['Weight']
-                                merged_df['납기일(Final_Date)'] = merged_df['Delivery_Date']
-                                all_data.append(merged_df)
-                            
-                            if all_data:
-                                final_df = pd.concat(all_data, ignore_index=True)
-                                
-                                # Duration 공정의 Days 컬럼이 없으면 기본값 추가
-                                for _, proc_row in processes_df.iterrows():
-                                    process_name = proc_row['Process Name']
-                                    process_type = proc_row['Type']
-                                    
-                                    if process_type == 'Duration':
-                                        days_col = f"{process_name}_Days"
-                                        if days_col not in final_df.columns:
-                                            final_df[days_col] = 5
-                                
-                                # 최종 컬럼 선택
-                                final_columns = ['프로젝트명', '블록명', '중량(Ton)', '납기일(Final_Date)', 'Fixed_Start_Date']
-                                for _, proc_row in processes_df.iterrows():
-                                    process_name = proc_row['Process Name']
-                                    process_type = proc_row['Type']
-                                    
-                                    if process_type == 'Duration':
-                                        days_col = f"{process_name}_Days"
-                                        if days_col in final_df.columns:
-                                            final_columns.append(days_col)
-                                
-                                final_df = final_df[final_columns]
-                                st.session_state.df_raw = final_df
+                            # 변경사항 먼저 저장 (변경 셀만 반영, 없으면 버전 유지)
+                            if apply_realtime_edits(edited_df, window_df):
+                                st.session_state.projects_db_version += 1
+
+                            # 데이터 통합 (스케줄링을 위해, 캐시된 통합 헬퍼 재사용)
+                            st.session_state.df_raw = integrate_projects_db(
+                                st.session_state.projects_db_version,
+                                get_processes_records(processes_df),
+                                st.session_state.projects_db
+                            )
                             
                             st.success("✅ 변경사항이 저장되었습니다! [스케줄링 메인] 탭에서 재계산하세요.")
     
@@ -1291,64 +1880,34 @@ def page_input():
     if len(st.session_state.projects_db) == 0:
         st.info("등록된 프로젝트가 없습니다.")
     else:
-        # 모든 프로젝트의 데이터를 통합
-        all_data = []
-        for project_no, project_df in st.session_state.projects_db.items():
-            # 컬럼명 변환 (스케줄링 엔진 호환)
-            merged_df = project_df.copy()
-            if 'Fixed_Start_Date' not in merged_df.columns:
-                merged_df['Fixed_Start_Date'] = pd.NaT
-            merged_df['프로젝트명'] = merged_df['Project_No']
-            merged_df['블록명'] = merged_df['Block_No']
-            merged_df['중량(Ton)'] = merged_df['Weight']
-            merged_df['납기일(Final_Date)'] = merged_df['Delivery_Date']
-            
-            all_data.append(merged_df)
-        
-        if all_data:
-            # 통합 데이터프레임 생성
-            final_df = pd.concat(all_data, ignore_index=True)
-            
-            # Duration 공정의 Days 컬럼이 없으면 기본값 추가
-            processes_df = st.session_state.processes_df
-            for _, proc_row in processes_df.iterrows():
-                process_name = proc_row['Process Name']
-                process_type = proc_row['Type']
-                
-                if process_type == 'Duration':
-                    days_col = f"{process_name}_Days"
-                    if days_col not in final_df.columns:
-                        final_df[days_col] = 5
-            
-            # 최종 컬럼 선택 (스케줄링 엔진에 필요한 컬럼만)
-            final_columns = ['프로젝트명', '블록명', '중량(Ton)', '납기일(Final_Date)', 'Fixed_Start_Date']
-            for _, proc_row in processes_df.iterrows():
-                process_name = proc_row['Process Name']
-                process_type = proc_row['Type']
-                
-                if process_type == 'Duration':
-                    days_col = f"{process_name}_Days"
-                    if days_col in final_df.columns:
-                        final_columns.append(days_col)
-            
-            final_df = final_df[final_columns]
-            st.session_state.df_raw = final_df
-            
-            st.success(f"✅ {len(final_df)}개 블록의 데이터가 통합되었습니다!")
-            # 날짜만 표시 (시간 제거)
-            display_final_df = final_df.copy()
-            if '납기일(Final_Date)' in display_final_df.columns:
-                display_final_df['납기일(Final_Date)'] = pd.to_datetime(display_final_df['납기일(Final_Date)']).dt.date
-            st.dataframe(display_final_df, use_container_width=True, hide_index=True)
-            
-            # 다운로드 버튼
-            csv = final_df.to_csv(index=False, encoding='utf-8-sig')
-            st.download_button(
-                label="📥 통합 데이터 다운로드 (CSV)",
-                data=csv,
-                file_name=f"통합데이터_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
-                mime="text/csv"
-            )
+        # 데이터가 바뀌지 않은 rerun에서는 캐시된 통합 결과 재사용
+        final_df = integrate_projects_db(
+            st.session_state.projects_db_version,
+            get_processes_records(st.session_state.processes_df),
+            st.session_state.projects_db
+        )
+        st.session_state.df_raw = final_df
+
+        st.success(f"✅ {len(final_df)}개 블록의 데이터가 통합되었습니다!")
+        # 날짜만 표시 (시간 제거)
+        display_final_df = final_df
+        if '납기일(Final_Date)' in display_final_df.columns:
+            display_final_df = final_df.assign(**{
+                '납기일(Final_Date)': final_df['납기일(Final_Date)'].dt.date
+            })
+        st.dataframe(display_final_df, use_container_width=True, hide_index=True)
+
+        # 다운로드 버튼 (클릭 시점에만 직렬화하고, 같은 버전이면 캐시 재사용)
+        db_version = st.session_state.projects_db_version
+        processes_records = get_processes_records(st.session_state.processes_df)
+        st.download_button(
+            label="📥 통합 데이터 다운로드 (CSV)",
+            data=lambda: build_integrated_csv_bytes(
+                db_version, processes_records, final_df
+            ),
+            file_name=f"통합데이터_{datetime.now().strftime('%Y%m%d_%H%M%S')}.csv",
+            mime="text/csv"
+        )
 
 def page_schedule():
     """스케줄링 메인 페이지"""
@@ -1366,11 +1925,12 @@ def page_schedule():
         
         # 공통 휴무일
         st.markdown("#### 🌐 공통 휴무일")
-        date_list = generate_date_list()
+        # 오늘 날짜를 캐시 키로 넘겨 날짜가 바뀌면 목록이 자연히 갱신되도록 함
+        date_list = generate_date_list(date.today())
         
-        current_global_holidays_str = [
-            date_to_date_string(d) for d in sorted(st.session_state.global_holidays)
-        ]
+        current_global_holidays_str = stringify_holidays(
+            tuple(sorted(st.session_state.global_holidays))
+        )
         
         selected_global_holidays = st.multiselect(
             "공통 휴무일 선택",
@@ -1379,10 +1939,15 @@ def page_schedule():
             key="global_holidays_multiselect"
         )
         
-        selected_global_holidays_set = {
-            date_string_to_date(date_str) for date_str in selected_global_holidays
-        }
-        st.session_state.global_holidays = selected_global_holidays_set
+        selected_global_holidays_set = set(
+            date_strings_to_dates(selected_global_holidays)
+        )
+        if selected_global_holidays_set != st.session_state.global_holidays:
+            st.session_state.global_holidays_np = holiday_set_to_array(
+                selected_global_holidays_set
+            )
+            st.session_state.global_holidays = selected_global_holidays_set
+            refresh_holidays_total()
         
         st.divider()
         
@@ -1392,9 +1957,10 @@ def page_schedule():
         # Team Code와 Process Name 매핑
         team_options = ["팀 선택"]
         team_code_to_name = {}
-        for _, proc_row in st.session_state.processes_df.iterrows():
-            team_code = proc_row['Team Code']
-            process_name = proc_row['Process Name']
+        for team_code, process_name in zip(
+            st.session_state.processes_df['Team Code'],
+            st.session_state.processes_df['Process Name']
+        ):
             team_code_to_name[team_code] = process_name
             if team_code not in ['pnd', 'final']:  # PND와 납기는 제외
                 team_options.append(f"{process_name} ({team_code})")
@@ -1433,9 +1999,9 @@ def page_schedule():
             
             # 팀별 휴무일 설정
             current_team_holidays = st.session_state.team_settings[team_code]['team_holidays']
-            current_team_holidays_str = [
-                date_to_date_string(d) for d in sorted(current_team_holidays)
-            ]
+            current_team_holidays_str = stringify_holidays(
+                tuple(sorted(current_team_holidays))
+            )
             
             selected_team_holidays = st.multiselect(
                 f"{process_name}팀 전용 휴무일",
@@ -1444,19 +2010,27 @@ def page_schedule():
                 key=f"team_holidays_multiselect_{team_code}"
             )
             
-            selected_team_holidays_set = {
-                date_string_to_date(date_str) for date_str in selected_team_holidays
-            }
-            st.session_state.team_settings[team_code]['team_holidays'] = selected_team_holidays_set
+            selected_team_holidays_set = set(
+                date_strings_to_dates(selected_team_holidays)
+            )
+            if selected_team_holidays_set != st.session_state.team_settings[team_code]['team_holidays']:
+                st.session_state.team_settings[team_code]['team_holidays_np'] = holiday_set_to_array(
+                    selected_team_holidays_set
+                )
+                st.session_state.team_settings[team_code]['team_holidays'] = selected_team_holidays_set
+                refresh_holidays_total()
     
     # 메인 화면: 스케줄링 계산
     if st.button("🚀 스케줄 계산", type="primary", use_container_width=True):
         with st.spinner("스케줄을 계산하는 중..."):
-            df_scheduled = calculate_backward_schedule(
+            df_scheduled = calculate_backward_schedule_cached(
                 st.session_state.df_raw,
                 st.session_state.processes_df,
-                st.session_state.team_settings,
-                st.session_state.global_holidays
+                freeze_team_settings(st.session_state.team_settings),
+                freeze_holidays(
+                    st.session_state.global_holidays,
+                    st.session_state.get('global_holidays_np')
+                )
             )
             
             st.session_state.df_scheduled = df_scheduled
@@ -1464,7 +2038,9 @@ def page_schedule():
     
     # 결과 표시
     if 'df_scheduled' in st.session_state and st.session_state.df_scheduled is not None:
-        df_scheduled = st.session_state.df_scheduled.copy()
+        # 같은 객체에 쓰면 CoW로도 세션 원본이 보호되지 않으므로 얕은 복사로 분리
+        # (리스크 컬럼 추가/수정은 복사본에만 반영, 데이터 버퍼는 공유되어 저렴)
+        df_scheduled = st.session_state.df_scheduled.copy(deep=False)
 
         # ====================================================================
         # 리스크 분석: 기준일 대비 지연/보관 판단
@@ -1504,10 +2080,16 @@ def page_schedule():
         storage_mask = df_scheduled["Gap(일수)"] > 0
         forward_delay_mask = df_scheduled.get("Forward_Delay_Days", 0) > 0
 
-        df_scheduled.loc[delay_mask, "예상 납기일"] = (
-            pd.to_datetime(df_scheduled.loc[delay_mask, "납기일(Final_Date)"]) +
-            pd.to_timedelta(df_scheduled.loc[delay_mask, "지연/보관일수"], unit="D")
-        )
+        if delay_mask.any():
+            # 지연 블록은 기준일부터 실제 공정 순산으로 완료 예상일을 계산
+            completion_dates = calculate_forward_schedule(
+                st.session_state.df_scheduled[delay_mask.values],
+                st.session_state.processes_df,
+                st.session_state.team_settings,
+                st.session_state.global_holidays,
+                기준일
+            )
+            df_scheduled.loc[delay_mask, "예상 납기일"] = pd.to_datetime(completion_dates)
         df_scheduled.loc[storage_mask, "착수 여유"] = df_scheduled.loc[storage_mask, "지연/보관일수"].apply(
             lambda days: f"오늘 안 하고 {days}일 뒤에 시작해도 됨"
         )
@@ -1528,25 +2110,31 @@ def page_schedule():
             f"### 총 지연 블록: {total_delay}개 / 총 보관 필요 블록: {total_storage}개"
         )
         
-        # 1. _Days로 끝나는 컬럼 제외 (입력 시수는 결과표에서 숨김)
-        columns_to_keep = [col for col in df_scheduled.columns if not col.endswith("_Days")]
-        df_scheduled = df_scheduled[columns_to_keep]
-        
-        # 날짜 포맷팅 (MM-DD)
-        date_columns = [col for col in df_scheduled.columns 
-                       if col.endswith("_Start") or col.endswith("_End") 
-                       or col.endswith("일") or col == "PND" or col == "납기일(Final_Date)"
-                       or col == "전체_Start_Date" or col == "예상 납기일"]
-        for col in date_columns:
-            if col in df_scheduled.columns:
-                df_scheduled[col] = pd.to_datetime(df_scheduled[col]).dt.strftime("%m-%d")
+        # 1. _Days 컬럼 제외(입력 시수 숨김)와 날짜 포맷팅(MM-DD)을 한 번의 프레임 구성으로 처리
+        def _is_result_date_col(col):
+            return (col.endswith("_Start") or col.endswith("_End")
+                    or col.endswith("일")
+                    or col in ("PND", "납기일(Final_Date)", "전체_Start_Date", "예상 납기일"))
+
+        display_cols = {}
+        for col in df_scheduled.columns:
+            if col.endswith("_Days"):
+                continue
+            series = df_scheduled[col]
+            if _is_result_date_col(col):
+                # 이미 datetime인 컬럼은 재파싱 없이 바로 포맷, 혼합(object) 컬럼만 파싱
+                if not pd.api.types.is_datetime64_any_dtype(series):
+                    series = pd.to_datetime(series)
+                series = series.dt.strftime("%m-%d")
+            display_cols[col] = series
+        df_scheduled = pd.DataFrame(display_cols)
         
         # 2. 컬럼 순서 재정렬 (깔끔한 결과표)
         # 2-1. 기본 정보 + 리스크 컬럼
         column_order = ["상태", "지연/보관일수", "비고", "프로젝트명", "블록명", "중량(Ton)", "납기일(Final_Date)"]
         
         # 2-2. 공정 순서(Order)에 따라 결과 날짜만 표시
-        processes_sorted = st.session_state.processes_df.sort_values('Order').to_dict('records')
+        processes_sorted = get_processes_records(st.session_state.processes_df)
         
         for process in processes_sorted:
             process_name = process['Process Name']
@@ -1574,9 +2162,10 @@ def page_schedule():
         if "PND" in df_scheduled.columns:
             column_order.append("PND")
         
-        # 존재하는 컬럼만 선택
+        # 존재하는 컬럼만 선택 (멤버십 검사는 집합으로)
         existing_columns = [col for col in column_order if col in df_scheduled.columns]
-        remaining_columns = [col for col in df_scheduled.columns if col not in existing_columns]
+        existing_set = set(existing_columns)
+        remaining_columns = [col for col in df_scheduled.columns if col not in existing_set]
         df_display = df_scheduled[existing_columns + remaining_columns]
         
         # 결과 테이블
@@ -1592,15 +2181,10 @@ def page_schedule():
         styled_df = df_display.style.apply(_row_highlight, axis=1)
         st.dataframe(styled_df, use_container_width=True, hide_index=True)
         
-        # 엑셀 다운로드 버튼 (동일한 형식으로)
-        excel_buffer = io.BytesIO()
-        with pd.ExcelWriter(excel_buffer, engine='openpyxl') as writer:
-            df_display.to_excel(writer, index=False, sheet_name='Schedule_Result')
-        excel_buffer.seek(0)
-        
+        # 엑셀 다운로드 버튼 (클릭 시점에만 생성하고, 결과가 같으면 캐시 재사용)
         st.download_button(
             label="📥 스케줄 결과 다운로드 (.xlsx)",
-            data=excel_buffer.getvalue(),
+            data=lambda: build_schedule_result_bytes(df_display),
             file_name=f"스케줄결과_{datetime.now().strftime('%Y%m%d_%H%M%S')}.xlsx",
             mime="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet"
         )
@@ -1608,168 +2192,82 @@ def page_schedule():
         # 간트 차트
         st.markdown("#### 📈 간트 차트")
         
-        # 간트 차트 데이터 준비
-        gantt_data = []
-        for idx, row in st.session_state.df_scheduled.iterrows():
-            project_name = row.get("프로젝트명", f"프로젝트{idx}")
-            block_name = row.get("블록명", f"블록{idx}")
-            note = row.get("비고", "")
-            
-            for process in processes_sorted:
-                process_name = process['Process Name']
-                process_type = process['Type']
-                
-                if process_name in ['PND', '납기']:
-                    continue
-                
-                if process_type == 'Duration':
-                    start_col = f"{process_name}_Start"
-                    end_col = f"{process_name}_End"
-                    if start_col in row and end_col in row:
-                        start_date = pd.to_datetime(row[start_col])
-                        end_date = pd.to_datetime(row[end_col])
-                        gantt_data.append({
-                            'Task': f"{project_name}-{block_name}",
-                            'Process': process_name,
-                            'Start': start_date,
-                            'Finish': end_date,
-                            'Duration': (end_date - start_date).days + 1,
-                            'Note': note
-                        })
-                elif process_type == 'Milestone':
-                    milestone_col = f"{process_name}일"
-                    if milestone_col in row:
-                        milestone_date = pd.to_datetime(row[milestone_col])
-                        gantt_data.append({
-                            'Task': f"{project_name}-{block_name}",
-                            'Process': process_name,
-                            'Start': milestone_date,
-                            'Finish': milestone_date,
-                            'Duration': 1,
-                            'Note': note
-                        })
-        
-        if gantt_data:
-            gantt_df = pd.DataFrame(gantt_data)
-            
-            # 날짜 범위 계산 (주말 음영 처리를 위해)
-            all_dates = []
-            for _, row in gantt_df.iterrows():
-                all_dates.append(row['Start'])
-                all_dates.append(row['Finish'])
-            min_date = pd.to_datetime(min(all_dates)).date()
-            max_date = pd.to_datetime(max(all_dates)).date()
-            
-            # Plotly 간트 차트 생성
-            fig = px.timeline(
-                gantt_df,
-                x_start='Start',
-                x_end='Finish',
-                y='Task',
-                color='Process',
-                title='생산 스케줄 간트 차트',
-                hover_data=['Note']
-            )
-            
-            # 1. 격자선 및 배경 강화
-            # X축: 매주 월요일마다 진한 회색 세로선
-            # 먼저 첫 번째 월요일 찾기
-            current_date = min_date
-            while current_date.weekday() != 0:  # 0 = 월요일
-                current_date += timedelta(days=1)
-            
-            # 모든 월요일에 세로선 추가
-            monday_dates = []
-            while current_date <= max_date:
-                monday_dates.append(pd.Timestamp(current_date))
-                current_date += timedelta(days=7)
-            
-            # 주말 음영 처리 (토요일과 일요일)
-            current_date = min_date
-            while current_date <= max_date:
-                weekday = current_date.weekday()
-                if weekday == 5:  # 토요일
-                    saturday = pd.Timestamp(current_date)
-                    sunday = saturday + pd.Timedelta(days=1)
-                    fig.add_vrect(
-                        x0=saturday,
-                        x1=sunday + pd.Timedelta(days=1),
-                        fillcolor="lightgray",
-                        opacity=0.2,
-                        layer="below",
-                        line_width=0
-                    )
-                current_date += timedelta(days=1)
-            
-            # 2. 막대 디자인 개선
-            # 막대에 테두리 추가 및 스타일 개선
-            fig.update_traces(
-                marker_line_width=1,
-                marker_line_color='darkgray',
-                selector=dict(type='bar')
-            )
-            
-            # 3. X축 설정 (1주일 간격, 날짜+요일 형식)
-            # 월요일 날짜 리스트 생성 (라벨용)
-            monday_labels = []
-            monday_positions = []
-            current_date = min_date
-            while current_date.weekday() != 0:
-                current_date += timedelta(days=1)
-            
-            while current_date <= max_date:
-                monday_positions.append(pd.Timestamp(current_date))
-                # "05-01(월)" 형식으로 라벨 생성
-                weekday_name = WEEKDAY_NAMES[current_date.weekday()]
-                label = f"{current_date.strftime('%m-%d')}({weekday_name})"
-                monday_labels.append(label)
-                current_date += timedelta(days=7)
-            
-            fig.update_xaxes(
-                tickmode='array',
-                tickvals=monday_positions,
-                ticktext=monday_labels,
-                tickangle=-45,
-                showgrid=True,
-                gridwidth=2,
-                gridcolor='darkgray',
-                showline=True,
-                linewidth=2,
-                linecolor='black',
-                rangeslider_visible=True,  # 4. Range Slider 추가
-                rangeslider_thickness=0.1
-            )
-            
-            # Y축 설정 (가로선 추가)
-            fig.update_yaxes(
-                autorange="reversed",
-                showgrid=True,
-                gridwidth=1,
-                gridcolor='lightgray',
-                showline=True,
-                linewidth=1,
-                linecolor='black'
-            )
-            
-            # 4. 레이아웃 개선
-            fig.update_layout(
-                height=600,
-                xaxis_title="날짜",
-                yaxis_title="프로젝트-블록",
-                plot_bgcolor='white',
-                paper_bgcolor='white',
-                hovermode='closest',
-                showlegend=True,
-                legend=dict(
-                    orientation="h",
-                    yanchor="bottom",
-                    y=1.02,
-                    xanchor="right",
-                    x=1
+        # 간트 차트 데이터 준비 (행×공정 이중 루프 대신 repeat/tile 벡터 구성)
+        df_gantt_src = st.session_state.df_scheduled
+        n_rows = len(df_gantt_src)
+        # Task 라벨은 한 번만 만들고 범주형으로 유지 (행×공정 수만큼 문자열 복제 방지)
+        task_strings = (
+            df_gantt_src['프로젝트명'].astype(str) + '-' + df_gantt_src['블록명'].astype(str)
+        )
+        task_order = pd.unique(task_strings).tolist()
+        task_values = pd.Categorical(task_strings, categories=task_order)
+        if '비고' in df_gantt_src.columns:
+            note_values = df_gantt_src['비고'].to_numpy()
+        else:
+            note_values = np.full(n_rows, '', dtype=object)
+
+        duration_names = [
+            p['Process Name'] for p in processes_sorted
+            if p['Type'] == 'Duration' and p['Process Name'] not in ('PND', '납기')
+            and f"{p['Process Name']}_Start" in df_gantt_src.columns
+            and f"{p['Process Name']}_End" in df_gantt_src.columns
+        ]
+        milestone_names = [
+            p['Process Name'] for p in processes_sorted
+            if p['Type'] == 'Milestone' and p['Process Name'] not in ('PND', '납기')
+            and f"{p['Process Name']}일" in df_gantt_src.columns
+        ]
+
+        gantt_frames = []
+        if duration_names and n_rows:
+            gantt_frames.append(pd.DataFrame({
+                'Task': task_values.repeat(len(duration_names)),
+                'Process': np.tile(np.array(duration_names, dtype=object), n_rows),
+                'Start': df_gantt_src[[f"{n}_Start" for n in duration_names]].to_numpy().ravel(),
+                'Finish': df_gantt_src[[f"{n}_End" for n in duration_names]].to_numpy().ravel(),
+                'Note': np.repeat(note_values, len(duration_names)),
+            }))
+        if milestone_names and n_rows:
+            milestone_dates = df_gantt_src[[f"{n}일" for n in milestone_names]].to_numpy().ravel()
+            gantt_frames.append(pd.DataFrame({
+                'Task': task_values.repeat(len(milestone_names)),
+                'Process': np.tile(np.array(milestone_names, dtype=object), n_rows),
+                'Start': milestone_dates,
+                'Finish': milestone_dates,
+                'Note': np.repeat(note_values, len(milestone_names)),
+            }))
+
+        if gantt_frames:
+            gantt_df = pd.concat(gantt_frames, ignore_index=True)
+            gantt_df['Start'] = pd.to_datetime(gantt_df['Start'])
+            gantt_df['Finish'] = pd.to_datetime(gantt_df['Finish'])
+            gantt_df['Duration'] = (gantt_df['Finish'] - gantt_df['Start']).dt.days + 1
+
+            # 표시 기간 선택: 선택 구간과 겹치는 막대만 figure로 전달
+            range_min = gantt_df['Start'].min().date()
+            range_max = gantt_df['Finish'].max().date()
+            if range_min < range_max:
+                window_start, window_end = st.slider(
+                    "간트 차트 표시 기간",
+                    min_value=range_min,
+                    max_value=range_max,
+                    value=(range_min, range_max),
+                    format="MM-DD",
+                    key="gantt_date_window"
                 )
-            )
-            
-            st.plotly_chart(fig, use_container_width=True)
+                if (window_start, window_end) != (range_min, range_max):
+                    visible_mask = (
+                        (gantt_df['Start'] <= pd.Timestamp(window_end))
+                        & (gantt_df['Finish'] >= pd.Timestamp(window_start))
+                    )
+                    gantt_df = gantt_df[visible_mask].reset_index(drop=True)
+
+            if len(gantt_df) == 0:
+                st.info("선택한 기간에 표시할 공정이 없습니다.")
+            else:
+                # figure 구성(주말 음영/축 설정 포함)은 데이터가 같으면 캐시에서 재사용
+                fig = build_gantt_figure(gantt_df, tuple(task_order))
+                st.plotly_chart(fig, use_container_width=True)
         else:
             st.info("간트 차트를 생성할 데이터가 없습니다.")
         
@@ -1783,26 +2281,38 @@ def page_schedule():
         # 1. 기간별 보기 선택
         time_scale = st.radio(
             "기간 단위 선택",
-            options=["주간(Weekly)", "월간(Monthly)", "연간(Yearly)"],
+            options=list(LOAD_TIME_SCALES),
             index=1,  # 기본값: 월간
             horizontal=True,
             key="load_analysis_time_scale"
         )
         
-        # 원본 스케줄 데이터 가져오기 (날짜 포맷팅 전)
-        df_original = st.session_state.df_scheduled.copy()
+        # 원본 스케줄 데이터 가져오기 (날짜 포맷팅 전, 읽기 전용이라 복사 불필요)
+        df_original = st.session_state.df_scheduled
         
-        # Duration 타입 공정만 필터링
+        # Duration 타입 공정만 필터링 (원본이 Order 순이므로 필터만으로 순서 유지)
         duration_processes = st.session_state.processes_df[
             st.session_state.processes_df['Type'] == 'Duration'
-        ].sort_values('Order')
+        ]
         
         if len(duration_processes) == 0:
             st.warning("⚠️ Duration 타입 공정이 없습니다.")
         else:
-            # 공정별 부하율 분석
-            for _, proc_row in duration_processes.iterrows():
-                process_name = proc_row['Process Name']
+            # 등록된 프로젝트의 공정별 월간 CAPA 합계를 한 번만 집계
+            # (공정 루프마다 프로젝트 수만큼 dict를 조회하지 않음)
+            registered_projects = set(df_original['프로젝트명'].unique())
+            monthly_capa_by_process = {}
+            for (proj, proc), monthly_capa in st.session_state.project_capa.items():
+                if proj in registered_projects and monthly_capa and monthly_capa > 0:
+                    monthly_capa_by_process[proc] = (
+                        monthly_capa_by_process.get(proc, 0.0) + monthly_capa
+                    )
+
+            # 기간 단위 설정 조회 (freq와 CAPA 환산 계수를 같은 곳에서)
+            freq, capa_scale = LOAD_TIME_SCALES[time_scale]
+
+            # 공정별 부하율 분석 (이름만 필요하므로 컬럼 값 순회)
+            for process_name in duration_processes['Process Name']:
                 start_col = f"{process_name}_Start"
                 end_col = f"{process_name}_End"
                 days_col = f"{process_name}_Days"
@@ -1811,138 +2321,33 @@ def page_schedule():
                 if start_col not in df_original.columns or end_col not in df_original.columns:
                     continue
                 
-                # 부하 데이터 수집
-                load_data = []
-                
-                for idx, row in df_original.iterrows():
-                    if pd.isna(row[start_col]) or pd.isna(row[end_col]):
-                        continue
-                    
-                    start_date = pd.to_datetime(row[start_col])
-                    end_date = pd.to_datetime(row[end_col])
-                    weight = float(row.get('중량(Ton)', 0))
-                    project_name = row.get('프로젝트명', '')
-                    
-                    # Days 정보 가져오기
-                    if days_col in row and pd.notna(row[days_col]):
-                        days = int(row[days_col])
-                    else:
-                        days = (end_date - start_date).days + 1
-                    
-                    if days <= 0:
-                        continue
-                    
-                    # 일별 부하 계산 (중량을 작업일수로 나눔)
-                    daily_load = weight / days
-                    
-                    # 각 작업일에 부하 추가
-                    current_date = start_date
-                    while current_date <= end_date:
-                        load_data.append({
-                            'Date': current_date,
-                            'Process': process_name,
-                            'Project': project_name,
-                            'Daily_Load': daily_load,
-                            'Weight': weight
-                        })
-                        current_date += pd.Timedelta(days=1)
-                
-                if not load_data:
+                # 기간별 부하 합계 (블록-일 단위 전개 없이 기간 교차로 바로 집계)
+                aggregated = compute_period_load(
+                    df_original, start_col, end_col, days_col, freq
+                )
+                if aggregated is None:
                     continue
                 
-                load_df = pd.DataFrame(load_data)
-                
-                # 기간별 집계
-                if time_scale == "주간(Weekly)":
-                    load_df['Period'] = load_df['Date'].dt.to_period('W').astype(str)
-                    period_format = "%Y-W%U"
-                elif time_scale == "월간(Monthly)":
-                    load_df['Period'] = load_df['Date'].dt.to_period('M').astype(str)
-                    period_format = "%Y-%m"
-                else:  # 연간
-                    load_df['Period'] = load_df['Date'].dt.to_period('Y').astype(str)
-                    period_format = "%Y"
-                
-                # 기간별 합계
-                aggregated = load_df.groupby('Period')['Daily_Load'].sum().reset_index()
-                aggregated.columns = ['Period', 'Total_Load']
-                aggregated = aggregated.sort_values('Period')
-                
-                # CAPA 정보 가져오기 및 변환
-                capa_data = {}
-                has_capa = False
-                
-                # 모든 프로젝트의 CAPA 확인
-                for project_name in df_original['프로젝트명'].unique():
-                    capa_key = (project_name, process_name)
-                    monthly_capa = st.session_state.project_capa.get(capa_key, 0)
-                    
-                    if monthly_capa and monthly_capa > 0:
-                        has_capa = True
-                        # 기간별 CAPA 변환
-                        if time_scale == "주간(Weekly)":
-                            period_capa = monthly_capa / 4.3
-                        elif time_scale == "월간(Monthly)":
-                            period_capa = monthly_capa
-                        else:  # 연간
-                            period_capa = monthly_capa * 12
-                        
-                        capa_data[project_name] = period_capa
-                
-                # 전체 CAPA 계산 (모든 프로젝트 합산)
-                total_capa = sum(capa_data.values()) if capa_data else 0
-                
-                # 차트 생성
-                fig = go.Figure()
-                
-                # 막대 그래프 (부하량)
-                colors = []
-                for load in aggregated['Total_Load']:
-                    if has_capa and total_capa > 0 and load > total_capa:
-                        colors.append('red')  # CAPA 초과
-                    else:
-                        colors.append('steelblue')  # 정상
-                
-                fig.add_trace(go.Bar(
-                    x=aggregated['Period'],
-                    y=aggregated['Total_Load'],
-                    name='작업 물량',
-                    marker_color=colors,
-                    text=[f"{load:.1f} Ton" for load in aggregated['Total_Load']],
-                    textposition='outside'
-                ))
+                # 전체 CAPA (공정별 월간 합계를 기간 단위로 변환)
+                monthly_capa_total = monthly_capa_by_process.get(process_name, 0.0)
+                has_capa = monthly_capa_total > 0
+                total_capa = monthly_capa_total * capa_scale
                 
-                # CAPA 기준선 (CAPA 정보가 있는 경우만)
-                if has_capa and total_capa > 0:
-                    fig.add_trace(go.Scatter(
-                        x=aggregated['Period'],
-                        y=[total_capa] * len(aggregated),
-                        mode='lines',
-                        name=f'CAPA 기준선 ({total_capa:.1f} Ton)',
-                        line=dict(color='orange', width=2, dash='dash'),
-                        hovertemplate='CAPA: %{y:.1f} Ton<extra></extra>'
-                    ))
-                
-                # 차트 레이아웃 설정
-                fig.update_layout(
-                    title=f'{process_name} 공정 부하율 분석 ({time_scale})',
-                    xaxis_title='기간',
-                    yaxis_title='중량 (Ton)',
-                    height=400,
-                    hovermode='x unified',
-                    showlegend=True
+                # 공정별 차트 표시 (집계/CAPA가 같은 rerun에서는 캐시된 figure 재사용)
+                fig = build_load_figure(
+                    aggregated, total_capa, has_capa, process_name, time_scale
                 )
-                
-                # 공정별 차트 표시
                 st.plotly_chart(fig, use_container_width=True)
                 
                 # 요약 정보 표시
                 col1, col2, col3 = st.columns(3)
+                # 집계 배열 한 벌로 두 지표를 모두 환산 (Series 재순회 없음)
+                load_values = aggregated['Total_Load'].to_numpy()
+                max_load = float(load_values.max())
+                avg_load = float(load_values.mean())
                 with col1:
-                    max_load = aggregated['Total_Load'].max()
                     st.metric("최대 부하", f"{max_load:.1f} Ton")
                 with col2:
-                    avg_load = aggregated['Total_Load'].mean()
                     st.metric("평균 부하", f"{avg_load:.1f} Ton")
                 with col3:
                     if has_capa and total_capa > 0:
@@ -1979,26 +2384,11 @@ if __name__ == "__main__":
             menu_icon="cast",
             default_index=0,
             orientation="horizontal",
-            styles={
-                "container": {"padding": "0!important", "background-color": "#fafafa"},
-                "icon": {"color": "orange", "font-size": "18px"},
-                "nav-link": {
-                    "font-size": "16px",
-                    "text-align": "center",
-                    "margin": "0px",
-                    "--hover-color": "#eee",
-                },
-                "nav-link-selected": {"background-color": "#02ab21"},
-            }
+            styles=MENU_STYLES
         )
-    
+
     with col2:
-        st.markdown(
-            f'<div style="text-align: right; padding-top: 10px; color: #666; font-size: 12px;">'
-            f'{APP_VERSION}<br>{APP_AUTHOR}'
-            f'</div>',
-            unsafe_allow_html=True
-        )
+        st.markdown(VERSION_HTML, unsafe_allow_html=True)
     
     # 페이지 라우팅
     if selected == "홈(Home)":